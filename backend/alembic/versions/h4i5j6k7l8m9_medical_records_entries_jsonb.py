@@ -0,0 +1,45 @@
+"""Convert medical_records.entries to JSONB with a GIN index
+
+Revision ID: h4i5j6k7l8m9
+Revises: g3h4i5j6k7l8
+Create Date: 2026-02-10 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'h4i5j6k7l8m9'
+down_revision: Union[str, Sequence[str], None] = 'g3h4i5j6k7l8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Change entries from JSON to JSONB and index it for containment/path queries."""
+    op.execute("""
+        ALTER TABLE medical_records
+        ALTER COLUMN entries TYPE JSONB
+        USING entries::JSONB
+    """)
+    op.create_index(
+        'ix_medical_records_entries',
+        'medical_records',
+        ['entries'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'entries': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Revert entries to JSON and drop the GIN index."""
+    op.drop_index('ix_medical_records_entries', table_name='medical_records')
+    op.execute("""
+        ALTER TABLE medical_records
+        ALTER COLUMN entries TYPE JSON
+        USING entries::JSON
+    """)
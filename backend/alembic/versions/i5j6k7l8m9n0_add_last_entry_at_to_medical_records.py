@@ -0,0 +1,39 @@
+"""Add last_entry_at to medical_records
+
+Revision ID: i5j6k7l8m9n0
+Revises: h4i5j6k7l8m9
+Create Date: 2026-02-10 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'i5j6k7l8m9n0'
+down_revision: Union[str, Sequence[str], None] = 'h4i5j6k7l8m9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add an indexed last_entry_at column and backfill it from the last entry."""
+    op.add_column('medical_records', sa.Column('last_entry_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Entries are appended in order, so the last element holds the newest timestamp
+    op.execute("""
+        UPDATE medical_records
+        SET last_entry_at = (entries -> -1 ->> 'timestamp')::timestamptz
+        WHERE jsonb_typeof(entries) = 'array'
+          AND jsonb_array_length(entries) > 0
+    """)
+
+    op.create_index(op.f('ix_medical_records_last_entry_at'), 'medical_records', ['last_entry_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Remove last_entry_at column."""
+    op.drop_index(op.f('ix_medical_records_last_entry_at'), table_name='medical_records')
+    op.drop_column('medical_records', 'last_entry_at')
@@ -0,0 +1,43 @@
+"""Convert triage_data.medical_history to JSONB with a full-text search index
+
+Revision ID: j6k7l8m9n0o1
+Revises: i5j6k7l8m9n0
+Create Date: 2026-02-10 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'j6k7l8m9n0o1'
+down_revision: Union[str, Sequence[str], None] = 'i5j6k7l8m9n0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Change medical_history from JSON to JSONB and add a GIN tsvector index."""
+    op.execute("""
+        ALTER TABLE triage_data
+        ALTER COLUMN medical_history TYPE JSONB
+        USING medical_history::JSONB
+    """)
+    # Must match app.models.patient.MEDICAL_HISTORY_TSV so searches use the index
+    op.execute("""
+        CREATE INDEX ix_triage_data_medical_history_tsv
+        ON triage_data
+        USING gin (jsonb_to_tsvector('simple', medical_history, '["string"]'))
+    """)
+
+
+def downgrade() -> None:
+    """Drop the search index and revert medical_history to JSON."""
+    op.drop_index('ix_triage_data_medical_history_tsv', table_name='triage_data')
+    op.execute("""
+        ALTER TABLE triage_data
+        ALTER COLUMN medical_history TYPE JSON
+        USING medical_history::JSON
+    """)
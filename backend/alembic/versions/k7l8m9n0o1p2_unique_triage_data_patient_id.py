@@ -0,0 +1,37 @@
+"""Make triage_data.patient_id unique
+
+Revision ID: k7l8m9n0o1p2
+Revises: j6k7l8m9n0o1
+Create Date: 2026-02-10 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'k7l8m9n0o1p2'
+down_revision: Union[str, Sequence[str], None] = 'j6k7l8m9n0o1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace the patient_id index with a unique one so triage data can be upserted."""
+    # Keep only the most recent triage row per patient before enforcing uniqueness
+    op.execute("""
+        DELETE FROM triage_data t
+        USING triage_data newer
+        WHERE t.patient_id = newer.patient_id
+          AND t.id < newer.id
+    """)
+    op.drop_index(op.f('ix_triage_data_patient_id'), table_name='triage_data')
+    op.create_index(op.f('ix_triage_data_patient_id'), 'triage_data', ['patient_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Revert patient_id to a non-unique index."""
+    op.drop_index(op.f('ix_triage_data_patient_id'), table_name='triage_data')
+    op.create_index(op.f('ix_triage_data_patient_id'), 'triage_data', ['patient_id'], unique=False)
@@ -0,0 +1,40 @@
+"""Add composite index for appointment slot lookups
+
+Revision ID: l8m9n0o1p2q3
+Revises: k7l8m9n0o1p2
+Create Date: 2026-02-10 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'l8m9n0o1p2q3'
+down_revision: Union[str, Sequence[str], None] = 'k7l8m9n0o1p2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index appointments by (specialty, status, appointment_date) without locking writes."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_appointments_specialty_status_date',
+            'appointments',
+            ['specialty', 'status', 'appointment_date'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Remove the slot lookup index."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_appointments_specialty_status_date',
+            table_name='appointments',
+            postgresql_concurrently=True,
+        )
@@ -9,10 +9,11 @@ from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import create_access_token
 from app.core.rate_limit import limiter
+from app.exceptions import DniAlreadyRegistered
 from app.models.user import UserRole
 from app.schemas.auth import LoginRequest, StaffLoginRequest, Token
 from app.schemas.user import UserCreate, UserResponse
-from app.services.auth_service import AuthService
+from app.services.auth_service import AuthService, hash_password_async
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -39,7 +40,7 @@ async def login(
         )
     
     access_token = auth_service.create_token(user)
-    return Token(access_token=access_token, user=UserResponse.model_validate(user))
+    return Token(access_token=access_token, user=UserResponse.from_orm_fast(user))
 
 
 @router.post("/login/staff", response_model=Token)
@@ -83,10 +84,9 @@ async def login_staff(
     
     if not staff_user:
         # Create the staff user if it doesn't exist
-        from app.core.security import get_password_hash
         staff_user = User(
             dni="staff",
-            hashed_password=get_password_hash(current_staff_password),
+            hashed_password=await hash_password_async(current_staff_password),
             full_name="Personal Administrativo",
             role=UserRole.STAFF,
             is_active=True
@@ -98,7 +98,7 @@ async def login_staff(
     # Create token with staff role
     access_token = create_access_token({"sub": staff_user.dni, "role": UserRole.STAFF.value})
     
-    return Token(access_token=access_token, user=UserResponse.model_validate(staff_user))
+    return Token(access_token=access_token, user=UserResponse.from_orm_fast(staff_user))
 
 
 from app.schemas.security import AdminVerifyRequest, StaffPasswordUpdateRequest
@@ -168,13 +168,18 @@ async def register(
             full_name=user_data.full_name,
             role=user_data.role,
         )
-        return UserResponse.model_validate(user)
+        return UserResponse.from_orm_fast(user)
     except ValueError as e:
         # Handle DNI not authorized error
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=str(e),
         )
+    except DniAlreadyRegistered as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
     except IntegrityError:
         await db.rollback()
         raise HTTPException(
@@ -1,7 +1,6 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
@@ -13,7 +12,7 @@ from app.repositories.triage_repository import TriageRepository
 from app.repositories.user_repository import UserRepository
 from app.repositories.medical_record_repository import MedicalRecordRepository
 from app.repositories.allowed_person_repository import AllowedPersonRepository
-from app.schemas.patient import PatientExportData, TriageDataResponse, TriageDataUpdate
+from app.schemas.patient import PatientExportData, PatientExportList, TriageDataResponse, TriageDataUpdate
 from app.schemas.medical_record import (
     MedicalRecordResponse,
     MedicalRecordEntryCreate,
@@ -45,44 +44,32 @@ async def update_medical_history(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tiene permisos para acceder a los datos de otro paciente",
         )
-    # Verify patient exists
+    # Verify patient exists, loading its medical record alongside
     user_repo = UserRepository(db)
-    patient = await user_repo.get_by_id(patient_id)
+    patient = await user_repo.get_with_record(patient_id)
     if not patient:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Paciente no encontrado",
         )
     
-    # Get or create triage data
+    # Create or update triage data in one round trip
     triage_repo = TriageRepository(db)
-    triage_data = await triage_repo.get_by_patient_id(patient_id)
-    
-    if triage_data:
-        # Update existing triage data
-        triage_data = await triage_repo.update(
-            triage_data=triage_data,
-            medical_history=data.medical_history,
-            allergies=data.allergies,
-        )
-    else:
-        # Create new triage data
-        triage_data = await triage_repo.create(
-            patient_id=patient_id,
-            medical_history=data.medical_history,
-            allergies=data.allergies,
-        )
+    triage_data = await triage_repo.upsert(
+        patient_id=patient_id,
+        medical_history=data.medical_history,
+        allergies=data.allergies,
+    )
     
     # Auto-create medical record if it doesn't exist
-    medical_record_repo = MedicalRecordRepository(db)
-    medical_record = await medical_record_repo.get_by_patient_id(patient_id)
-    if not medical_record and data.medical_history:
+    if not patient.medical_record and data.medical_history:
+        medical_record_repo = MedicalRecordRepository(db)
         await medical_record_repo.create(
             patient_id=patient_id,
             registration_survey=data.medical_history
         )
     
-    return TriageDataResponse.model_validate(triage_data)
+    return TriageDataResponse.from_orm_fast(triage_data)
 
 
 @router.get("/{patient_id}/medical-history", response_model=TriageDataResponse)
@@ -114,24 +101,22 @@ async def get_medical_history(
             detail="Paciente no encontrado",
         )
     
-    # Get triage data
     triage_repo = TriageRepository(db)
     triage_data = await triage_repo.get_by_patient_id(patient_id)
-    
     if not triage_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No se encontró historial médico para este paciente",
         )
     
-    return TriageDataResponse.model_validate(triage_data)
+    return TriageDataResponse.from_orm_fast(triage_data)
 
 
 @router.get("/", response_model=list[PatientExportData])
 async def list_all_patients(
     db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(require_role(["doctor", "admin", "staff"]))],
-) -> list[PatientExportData]:
+) -> Response:
     """
     List all patients with their medical data for export.
     
@@ -153,18 +138,23 @@ async def list_all_patients(
     result = await db.execute(query)
     rows = result.all()
     
-    # Build response from the joined results
-    return [
-        PatientExportData(
-            id=user.id,
-            dni=user.dni,
-            full_name=user.full_name,
-            is_active=user.is_active,
-            medical_history=triage.medical_history if triage else None,
-            allergies=triage.allergies if triage else None,
-        )
+    # Build response from the joined results, validated and serialized in bulk.
+    # Returning a Response skips FastAPI's second pass over response_model.
+    patients = PatientExportList.validate_python([
+        {
+            "id": user.id,
+            "dni": user.dni,
+            "full_name": user.full_name,
+            "is_active": user.is_active,
+            "medical_history": triage.medical_history if triage else None,
+            "allergies": triage.allergies if triage else None,
+        }
         for user, triage in rows
-    ]
+    ])
+    return Response(
+        content=PatientExportList.dump_json(patients),
+        media_type="application/json",
+    )
 
 
 @router.get("/{patient_id}/medical-record", response_model=MedicalRecordResponse)
@@ -196,17 +186,15 @@ async def get_medical_record(
             detail="Paciente no encontrado",
         )
     
-    # Get medical record
     medical_record_repo = MedicalRecordRepository(db)
     medical_record = await medical_record_repo.get_by_patient_id(patient_id)
-    
     if not medical_record:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No se encontró historia clínica para este paciente",
         )
     
-    return MedicalRecordResponse.model_validate(medical_record)
+    return MedicalRecordResponse.from_orm_fast(medical_record)
 
 
 @router.post("/{patient_id}/medical-record/entries", response_model=MedicalRecordResponse)
@@ -240,7 +228,7 @@ async def add_medical_record_entry(
             patient_id=patient_id,
             entry=entry.model_dump()
         )
-        return MedicalRecordResponse.model_validate(medical_record)
+        return MedicalRecordResponse.from_orm_fast(medical_record)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -272,21 +260,18 @@ async def get_medical_record_pdf(
         )
     from app.services.pdf_service import generate_medical_record_pdf
     
-    # Verify patient exists
-    user_repo = UserRepository(db)
-    patient = await user_repo.get_by_id(patient_id)
-    if not patient:
+    # Generate PDF (fails if the patient or the medical record does not exist)
+    try:
+        pdf_bytes = await generate_medical_record_pdf(patient_id, db)
+    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Paciente no encontrado",
+            detail=str(e),
         )
     
-    # Generate PDF
-    pdf_bytes = await generate_medical_record_pdf(patient_id, db)
-    
     # Return as downloadable file
-    return StreamingResponse(
-        pdf_bytes,
+    return Response(
+        content=pdf_bytes,
         media_type="application/pdf",
         headers={
             "Content-Disposition": f"attachment; filename=historia_clinica_{patient_id}.pdf"
@@ -308,7 +293,7 @@ async def bulk_create_allowed_persons(
     """
     allowed_person_repo = AllowedPersonRepository(db)
     
-    persons_data = [{"dni": p.dni, "full_name": p.full_name} for p in data.persons]
+    persons_data = [{"dni": p["dni"], "full_name": p.get("full_name")} for p in data.persons]
     created = await allowed_person_repo.bulk_create(persons_data)
     
     return {
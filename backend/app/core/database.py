@@ -1,16 +1,25 @@
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
+from pydantic_core import from_json, to_json
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import declarative_base
 
 from app.core.config import settings
 
+
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON/JSONB column values with pydantic-core's Rust encoder."""
+    return to_json(value).decode()
+
+
 # Create async engine
 engine: AsyncEngine = create_async_engine(
     settings.DATABASE_URL,
     echo=True,
     future=True,
+    json_serializer=_json_serializer,
+    json_deserializer=from_json,
 )
 
 # Create async session factory
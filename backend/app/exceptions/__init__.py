@@ -8,3 +8,8 @@ class ServiceUnavailable(Exception):
     of external services (like Oracle DB) from the rest of the application.
     """
     pass
+
+
+class DniAlreadyRegistered(Exception):
+    """Exception raised when a whitelisted DNI has already been used to register."""
+    pass
@@ -1,9 +1,14 @@
+from app.models.user import User, UserRole
+from app.models.patient import TriageData
 from app.models.category_schedule import CategorySchedule, CategoryType, RotationType
 from app.models.system_config import SystemConfig
 from app.models.allowed_person import AllowedPerson
 from app.models.medical_record import MedicalRecord
 
 __all__ = [
+    "User",
+    "UserRole",
+    "TriageData",
     "CategorySchedule", 
     "CategoryType", 
     "RotationType", 
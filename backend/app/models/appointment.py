@@ -2,8 +2,8 @@ import enum
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
 
@@ -19,6 +19,10 @@ class AppointmentStatus(str, enum.Enum):
 class Appointment(Base):
     """Appointment model - manages patient appointments with doctors."""
     __tablename__ = "appointments"
+    __table_args__ = (
+        # Serves the occupied-slot lookup (specialty + status + date range)
+        Index("ix_appointments_specialty_status_date", "specialty", "status", "appointment_date"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     patient_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
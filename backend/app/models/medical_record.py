@@ -1,12 +1,15 @@
 from datetime import datetime, timezone
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, func
-from sqlalchemy.dialects.postgresql import JSON
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
 
+if TYPE_CHECKING:
+    from app.models.user import User
+
 
 class MedicalRecord(Base):
     """
@@ -17,6 +20,14 @@ class MedicalRecord(Base):
     (consultations and laboratory results).
     """
     __tablename__ = "medical_records"
+    __table_args__ = (
+        Index(
+            "ix_medical_records_entries",
+            "entries",
+            postgresql_using="gin",
+            postgresql_ops={"entries": "jsonb_path_ops"},
+        ),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     patient_id: Mapped[int] = mapped_column(
@@ -27,7 +38,12 @@ class MedicalRecord(Base):
         nullable=False
     )
     registration_survey: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
-    entries: Mapped[list[dict[str, Any]]] = mapped_column(JSON, nullable=True, default=list)
+    # JSONB on PostgreSQL so entry filters can be pushed down (GIN-indexed)
+    entries: Mapped[list[dict[str, Any]]] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"),
+        nullable=True,
+        default=list
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
         nullable=False,
@@ -39,3 +55,13 @@ class MedicalRecord(Base):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc)
     )
+    # Timestamp of the newest entry, kept in sync by the repository so
+    # "recent activity" queries can use a B-tree range scan
+    last_entry_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        index=True
+    )
+    
+    # Relationship to User model
+    patient: Mapped["User"] = relationship(back_populates="medical_record", lazy="raise")
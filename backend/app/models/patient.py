@@ -1,24 +1,49 @@
 from datetime import datetime
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Text, func
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
 
+if TYPE_CHECKING:
+    from app.models.user import User
+
+# Full-text search document over every string value in medical_history.
+# The GIN index on triage_data is built on this exact expression, so `@@`
+# queries must use it verbatim to be index-assisted.
+MEDICAL_HISTORY_TSV = "jsonb_to_tsvector('simple', medical_history, '[\"string\"]')"
+
 
 class TriageData(Base):
     """Triage data model - stores patient medical history and allergies.
     
-    Note: medical_history is stored as JSON to support flexible fields for patient onboarding.
-    The JSON structure can contain any relevant medical information as key-value pairs.
+    Note: medical_history is stored as JSON (JSONB on PostgreSQL) to support flexible fields
+    for patient onboarding. The JSON structure can contain any relevant medical information
+    as key-value pairs.
     """
     __tablename__ = "triage_data"
+    __table_args__ = (
+        Index(
+            "ix_triage_data_medical_history_tsv",
+            text(MEDICAL_HISTORY_TSV),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    patient_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    medical_history: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    patient_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("users.id"),
+        unique=True,
+        index=True,
+        nullable=False
+    )
+    medical_history: Mapped[Optional[dict[str, Any]]] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"),
+        nullable=True
+    )
     allergies: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     last_updated: Mapped[datetime] = mapped_column(
         DateTime, 
@@ -28,4 +53,4 @@ class TriageData(Base):
     )
     
     # Relationship to User model
-    # Note: We don't define the back_populates here to avoid modifying the existing User model
+    patient: Mapped["User"] = relationship(back_populates="triage", lazy="raise")
@@ -2,7 +2,7 @@ import enum
 from datetime import time
 
 from sqlalchemy import ForeignKey, Integer, String, Time
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
 
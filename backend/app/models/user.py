@@ -1,11 +1,15 @@
 import enum
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from sqlalchemy import Boolean, Enum, Integer, String
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
 
+if TYPE_CHECKING:
+    from app.models.medical_record import MedicalRecord
+    from app.models.patient import TriageData
+
 
 class UserRole(str, enum.Enum):
     """User role enumeration."""
@@ -25,3 +29,12 @@ class User(Base):
     full_name: Mapped[str] = mapped_column(String(255), nullable=False)
     role: Mapped[UserRole] = mapped_column(Enum(UserRole), nullable=False, default=UserRole.PATIENT)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    
+    # Patient profile relationships. Lazy loading is disabled (it cannot run
+    # under AsyncSession); load them explicitly with selectinload.
+    triage: Mapped[Optional["TriageData"]] = relationship(
+        back_populates="patient", uselist=False, lazy="raise"
+    )
+    medical_record: Mapped[Optional["MedicalRecord"]] = relationship(
+        back_populates="patient", uselist=False, lazy="raise"
+    )
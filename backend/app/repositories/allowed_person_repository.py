@@ -1,10 +1,16 @@
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, exists, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.allowed_person import AllowedPerson
 
+# Built once at import time: the whitelist check runs on every patient
+# registration, so reuse the same statement (and its cached compilation)
+_DNI_EXISTS = select(exists().where(AllowedPerson.dni == bindparam("dni")))
+
 
 class AllowedPersonRepository:
     """Repository for AllowedPerson database operations."""
@@ -22,11 +28,8 @@ class AllowedPersonRepository:
         Returns:
             True if the DNI is allowed, False otherwise
         """
-        result = await self.session.execute(
-            select(AllowedPerson).where(AllowedPerson.dni == dni)
-        )
-        allowed_person = result.scalar_one_or_none()
-        return allowed_person is not None
+        result = await self.session.execute(_DNI_EXISTS, {"dni": dni})
+        return bool(result.scalar())
     
     async def mark_as_registered(self, dni: str) -> None:
         """
@@ -43,28 +46,63 @@ class AllowedPersonRepository:
             allowed_person.is_registered = True
             await self.session.commit()
     
+    async def authorize_and_mark(self, dni: str) -> bool:
+        """
+        Check that a DNI is whitelisted and not yet registered, and mark it as
+        registered, in one statement.
+        
+        The change is not committed here, so it is persisted (or rolled back)
+        together with the user being created in the same transaction.
+        
+        Args:
+            dni: The DNI to authorize
+            
+        Returns:
+            True if the DNI was whitelisted and unregistered, False otherwise
+        """
+        result = await self.session.execute(
+            update(AllowedPerson)
+            .where(AllowedPerson.dni == dni, AllowedPerson.is_registered.is_(False))
+            .values(is_registered=True)
+            .returning(AllowedPerson.id)
+        )
+        return result.scalar_one_or_none() is not None
+    
     async def bulk_create(self, persons: list[dict]) -> list[AllowedPerson]:
         """
         Create multiple allowed persons at once.
         
+        Uses a single INSERT ... ON CONFLICT (dni) DO NOTHING, so re-importing
+        a whitelist that overlaps existing DNIs skips the duplicates instead
+        of aborting the whole transaction.
+        
         Args:
             persons: List of dicts with 'dni' and optional 'full_name' keys
             
         Returns:
-            List of created AllowedPerson objects
+            List of newly created AllowedPerson objects (duplicates excluded)
         """
-        allowed_persons = [
-            AllowedPerson(
-                dni=person["dni"],
-                full_name=person.get("full_name"),
-                is_registered=False
-            )
+        if not persons:
+            return []
+        
+        values = [
+            {
+                "dni": person["dni"],
+                "full_name": person.get("full_name"),
+                "is_registered": False,
+            }
             for person in persons
         ]
-        self.session.add_all(allowed_persons)
+        insert = sqlite_insert if self.session.bind.dialect.name == "sqlite" else pg_insert
+        stmt = (
+            insert(AllowedPerson)
+            .values(values)
+            .on_conflict_do_nothing(index_elements=[AllowedPerson.dni])
+            .returning(AllowedPerson)
+        )
+        result = await self.session.execute(stmt)
+        allowed_persons = list(result.scalars().all())
         await self.session.commit()
-        for person in allowed_persons:
-            await self.session.refresh(person)
         return allowed_persons
     
     async def get_by_dni(self, dni: str) -> Optional[AllowedPerson]:
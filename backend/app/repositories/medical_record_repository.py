@@ -1,12 +1,70 @@
 from datetime import datetime, timezone
 from typing import Any, Optional
 
-from sqlalchemy import select
+from sqlalchemy import Select, Update, bindparam, func, literal, select, type_coerce, update
+from sqlalchemy.dialects.postgresql import JSONB, JSONPATH
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.medical_record import MedicalRecord
 
 
+def _filtered_entries_query(
+    patient_id: int,
+    entry_type: Optional[str],
+    since_str: Optional[str],
+) -> Select:
+    """PostgreSQL query returning a patient's entries filtered by a jsonpath."""
+    # Path is built from fixed fragments only; values travel as jsonpath vars
+    predicates = []
+    path_vars: dict[str, Any] = {}
+    if entry_type is not None:
+        predicates.append("@.entry_type == $entry_type")
+        path_vars["entry_type"] = entry_type
+    if since_str is not None:
+        predicates.append("@.timestamp >= $since")
+        path_vars["since"] = since_str
+    path = "$[*]"
+    if predicates:
+        path += " ? (" + " && ".join(predicates) + ")"
+    
+    query = select(
+        func.jsonb_path_query_array(
+            type_coerce(MedicalRecord.entries, JSONB),
+            literal(path, JSONPATH),
+            bindparam("path_vars", path_vars, type_=JSONB),
+            type_=JSONB,
+        )
+    ).where(MedicalRecord.patient_id == patient_id)
+    if entry_type is not None:
+        # Containment lets the GIN index discard records with no such entry
+        query = query.where(
+            type_coerce(MedicalRecord.entries, JSONB).contains([{"entry_type": entry_type}])
+        )
+    
+    return query
+
+
+def _append_entry_statement(
+    patient_id: int,
+    entry: dict[str, Any],
+    entry_timestamp: datetime,
+) -> Update:
+    """PostgreSQL UPDATE appending one entry to a patient's record, returning the row."""
+    entries = type_coerce(MedicalRecord.entries, JSONB)
+    return (
+        update(MedicalRecord)
+        .where(MedicalRecord.patient_id == patient_id)
+        .values(
+            entries=func.coalesce(entries, literal([], JSONB)).op("||", return_type=JSONB)(
+                bindparam("new_entries", [entry], type_=JSONB)
+            ),
+            last_entry_at=entry_timestamp,
+        )
+        .returning(MedicalRecord)
+        .execution_options(populate_existing=True)
+    )
+
+
 class MedicalRecordRepository:
     """Repository for MedicalRecord database operations."""
     
@@ -53,6 +111,65 @@ class MedicalRecordRepository:
         )
         return result.scalar_one_or_none()
     
+    async def get_entries(
+        self,
+        patient_id: int,
+        *,
+        entry_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Get a patient's medical record entries, optionally filtered.
+        
+        On PostgreSQL the filter is pushed down into a ``jsonb_path_query_array``
+        so only matching entries leave the database. Other backends (SQLite in
+        tests) filter the loaded entries in Python.
+        
+        Args:
+            patient_id: The patient's user ID
+            entry_type: Only return entries of this type (e.g. 'consultation')
+            since: Only return entries with a timestamp at or after this moment
+            
+        Returns:
+            List of matching entries, empty if the patient has no record
+        """
+        since_str = None
+        if since is not None:
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            since_str = since.astimezone(timezone.utc).isoformat()
+        
+        if self.session.bind.dialect.name != "postgresql":
+            medical_record = await self.get_by_patient_id(patient_id)
+            if not medical_record or not medical_record.entries:
+                return []
+            return [
+                entry for entry in medical_record.entries
+                if (entry_type is None or entry.get("entry_type") == entry_type)
+                and (since_str is None or entry.get("timestamp", "") >= since_str)
+            ]
+        
+        result = await self.session.execute(_filtered_entries_query(patient_id, entry_type, since_str))
+        return result.scalar_one_or_none() or []
+    
+    async def get_recently_updated(self, limit: int = 10) -> list[MedicalRecord]:
+        """
+        Get the medical records with the most recent entries.
+        
+        Args:
+            limit: Maximum number of records to return
+            
+        Returns:
+            List of MedicalRecord objects, newest entry first
+        """
+        result = await self.session.execute(
+            select(MedicalRecord)
+            .where(MedicalRecord.last_entry_at.is_not(None))
+            .order_by(MedicalRecord.last_entry_at.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+    
     async def add_entry(self, patient_id: int, entry: dict[str, Any]) -> MedicalRecord:
         """
         Add a new entry (consultation or lab result) to a patient's medical record.
@@ -64,6 +181,25 @@ class MedicalRecordRepository:
         Returns:
             The updated MedicalRecord object
         """
+        # Add timestamp to entry
+        entry_timestamp = datetime.now(timezone.utc)
+        entry_with_timestamp = {
+            **entry,
+            "timestamp": entry_timestamp.isoformat()
+        }
+        
+        if self.session.bind.dialect.name == "postgresql":
+            # Append in the database: one UPDATE ... RETURNING instead of a
+            # SELECT plus an UPDATE rewriting the whole array
+            result = await self.session.execute(
+                _append_entry_statement(patient_id, entry_with_timestamp, entry_timestamp)
+            )
+            medical_record = result.scalar_one_or_none()
+            if not medical_record:
+                raise ValueError(f"No medical record found for patient {patient_id}")
+            await self.session.commit()
+            return medical_record
+        
         result = await self.session.execute(
             select(MedicalRecord).where(MedicalRecord.patient_id == patient_id)
         )
@@ -72,12 +208,6 @@ class MedicalRecordRepository:
         if not medical_record:
             raise ValueError(f"No medical record found for patient {patient_id}")
         
-        # Add timestamp to entry
-        entry_with_timestamp = {
-            **entry,
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
-        
         # Append to entries array
         if medical_record.entries is None:
             medical_record.entries = []
@@ -85,6 +215,7 @@ class MedicalRecordRepository:
         current_entries = medical_record.entries.copy() if medical_record.entries else []
         current_entries.append(entry_with_timestamp)
         medical_record.entries = current_entries
+        medical_record.last_entry_at = entry_timestamp
         
         await self.session.commit()
         await self.session.refresh(medical_record)
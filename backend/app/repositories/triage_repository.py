@@ -1,6 +1,9 @@
+from datetime import datetime, timezone
 from typing import Optional
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.patient import TriageData
@@ -52,6 +55,49 @@ class TriageRepository:
         await self.session.refresh(triage_data)
         return triage_data
     
+    async def upsert(
+        self,
+        patient_id: int,
+        medical_history: Optional[dict] = None,
+        allergies: Optional[str] = None,
+    ) -> TriageData:
+        """
+        Create or update the triage data for a patient in a single statement.
+        
+        Relies on the unique patient_id index: INSERT ... ON CONFLICT (patient_id)
+        DO UPDATE replaces the read-then-update round trips and cannot create
+        duplicate rows under concurrent requests. As with update(), fields
+        passed as None keep their stored value.
+        """
+        insert = sqlite_insert if self.session.bind.dialect.name == "sqlite" else pg_insert
+        # Naive UTC, like the column's server default; computed here so the
+        # statement doesn't depend on a database-specific timezone() function
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        stmt = insert(TriageData).values(
+            patient_id=patient_id,
+            medical_history=medical_history,
+            allergies=allergies,
+            last_updated=now,
+        )
+        
+        set_ = {"last_updated": stmt.excluded.last_updated}
+        if medical_history is not None:
+            set_["medical_history"] = stmt.excluded.medical_history
+        if allergies is not None:
+            set_["allergies"] = stmt.excluded.allergies
+        
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TriageData.patient_id],
+            set_=set_,
+        ).returning(TriageData)
+        
+        result = await self.session.execute(
+            stmt, execution_options={"populate_existing": True}
+        )
+        triage_data = result.scalar_one()
+        await self.session.commit()
+        return triage_data
+    
     async def get_all(self) -> list[TriageData]:
         """Get all triage data."""
         result = await self.session.execute(
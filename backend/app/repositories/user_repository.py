@@ -2,6 +2,7 @@ from typing import Optional
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from app.models.user import User, UserRole
 
@@ -47,6 +48,16 @@ class UserRepository:
         )
         return result.scalar_one_or_none()
     
+    async def get_with_record(self, user_id: int) -> Optional[User]:
+        """Get user by ID with the medical record joined in the same query."""
+        result = await self.session.execute(
+            select(User)
+            .where(User.id == user_id)
+            .options(joinedload(User.medical_record))
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+    
     async def get_all_patients(self) -> list[User]:
         """Get all patients."""
         result = await self.session.execute(
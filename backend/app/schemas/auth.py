@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from app.schemas.user import UserResponse
+from pydantic import BaseModel, Field, field_validator
+from app.schemas.user import UserResponse, validate_dni
 
 
 class Token(BaseModel):
@@ -11,8 +11,10 @@ class Token(BaseModel):
 
 class LoginRequest(BaseModel):
     """Schema for login request."""
-    dni: str = Field(..., min_length=11, max_length=11, pattern=r"^\d{11}$", description="DNI/Cedula")
+    dni: str = Field(..., min_length=11, max_length=11, description="DNI/Cedula")
     password: str = Field(..., min_length=1, description="Password")
+    
+    _check_dni = field_validator("dni")(validate_dni)
 
 
 class StaffLoginRequest(BaseModel):
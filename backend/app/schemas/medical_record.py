@@ -1,21 +1,27 @@
 from datetime import datetime
-from typing import Any, Optional
+from typing import Annotated, Any, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing_extensions import NotRequired, TypedDict
 
 
 class MedicalRecordEntryCreate(BaseModel):
     """Schema for creating a new medical record entry."""
     
-    model_config = ConfigDict(json_schema_extra={
-        "example": {
-            "entry_type": "consultation",
-            "specialty": "Cardiology",
-            "doctor_name": "Dr. Juan Pérez",
-            "diagnosis": "Hypertension",
-            "notes": "Patient advised to reduce salt intake"
-        }
-    })
+    model_config = ConfigDict(
+        extra="forbid",
+        frozen=True,
+        strict=True,
+        json_schema_extra={
+            "example": {
+                "entry_type": "consultation",
+                "specialty": "Cardiology",
+                "doctor_name": "Dr. Juan Pérez",
+                "diagnosis": "Hypertension",
+                "notes": "Patient advised to reduce salt intake"
+            }
+        },
+    )
     
     entry_type: str = Field(..., description="Type of entry: 'consultation' or 'lab_result'")
     specialty: Optional[str] = Field(None, description="Medical specialty")
@@ -36,16 +42,45 @@ class MedicalRecordResponse(BaseModel):
     entries: list[dict[str, Any]] = []
     created_at: datetime
     last_updated: datetime
+    
+    @classmethod
+    def from_orm_fast(cls, medical_record) -> "MedicalRecordResponse":
+        """Build from a MedicalRecord row without re-validating already-typed ORM data."""
+        return cls.model_construct(
+            id=medical_record.id,
+            patient_id=medical_record.patient_id,
+            registration_survey=medical_record.registration_survey,
+            entries=medical_record.entries or [],
+            created_at=medical_record.created_at,
+            last_updated=medical_record.last_updated,
+        )
 
 
-class AllowedPersonCreate(BaseModel):
-    """Schema for creating an allowed person."""
+class AllowedPersonCreate(TypedDict):
+    """
+    Schema for creating an allowed person.
+    
+    A TypedDict rather than a model: bulk imports validate thousands of these
+    and plain dicts skip building a model instance per row.
+    """
     
-    dni: str = Field(..., description="DNI of the person")
-    full_name: Optional[str] = Field(None, description="Full name of the person")
+    __pydantic_config__ = ConfigDict(extra="forbid", strict=True)
+    
+    dni: Annotated[str, Field(min_length=11, max_length=11, description="DNI of the person")]
+    full_name: NotRequired[Annotated[Optional[str], Field(description="Full name of the person")]]
 
 
 class AllowedPersonBulkCreate(BaseModel):
     """Schema for bulk creating allowed persons."""
     
     persons: list[AllowedPersonCreate] = Field(..., description="List of persons to add")
+    
+    @field_validator("persons")
+    @classmethod
+    def check_dnis(cls, persons: list[AllowedPersonCreate]) -> list[AllowedPersonCreate]:
+        """Check every DNI is made of ASCII digits in one pass over the batch."""
+        # Length is already enforced per row by pydantic-core
+        invalid = [p["dni"] for p in persons if not (p["dni"].isascii() and p["dni"].isdigit())]
+        if invalid:
+            raise ValueError(f"DNIs must be exactly 11 digits: {', '.join(invalid[:10])}")
+        return persons
@@ -1,14 +1,18 @@
 from datetime import datetime
 from typing import Any, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+
+from app.schemas.user import validate_dni
 
 
 class PatientCreate(BaseModel):
     """Schema for creating a patient (step 1 of registration)."""
-    dni: str = Field(..., min_length=11, max_length=11, pattern=r"^\d{11}$", description="DNI/Cedula")
+    dni: str = Field(..., min_length=11, max_length=11, description="DNI/Cedula")
     full_name: str = Field(..., min_length=1, max_length=255, description="Full name")
     password: str = Field(..., min_length=6, description="Password")
+    
+    _check_dni = field_validator("dni")(validate_dni)
 
 
 class TriageDataCreate(BaseModel):
@@ -24,10 +28,9 @@ class TriageDataUpdate(BaseModel):
     allergies: Optional[str] = Field(None, description="Patient allergies")
 
 
-class TriageUpdate(BaseModel):
-    """Schema for updating patient triage information (step 2 of registration)."""
-    medical_history: Optional[dict[str, Any]] = Field(None, description="Patient medical history as JSON object with flexible fields")
-    allergies: Optional[str] = Field(None, description="Patient allergies")
+# Step 2 of registration sends the same payload as a triage update; reuse the
+# model instead of building an identical schema twice
+TriageUpdate = TriageDataUpdate
 
 
 class TriageDataResponse(BaseModel):
@@ -39,6 +42,17 @@ class TriageDataResponse(BaseModel):
     medical_history: Optional[dict[str, Any]]
     allergies: Optional[str]
     last_updated: datetime
+    
+    @classmethod
+    def from_orm_fast(cls, triage_data) -> "TriageDataResponse":
+        """Build from a TriageData row without re-validating already-typed ORM data."""
+        return cls.model_construct(
+            id=triage_data.id,
+            patient_id=triage_data.patient_id,
+            medical_history=triage_data.medical_history,
+            allergies=triage_data.allergies,
+            last_updated=triage_data.last_updated,
+        )
 
 
 class PatientExportData(BaseModel):
@@ -51,3 +65,8 @@ class PatientExportData(BaseModel):
     # Triage data (optional, as patient may not have filled it yet)
     medical_history: Optional[dict[str, Any]] = None
     allergies: Optional[str] = None
+
+
+# Validates/serializes a whole export in one pydantic-core call instead of
+# building each PatientExportData in Python and re-validating the response
+PatientExportList = TypeAdapter(list[PatientExportData])
@@ -3,13 +3,22 @@ from pydantic import BaseModel, ConfigDict, Field, field_validator
 from app.models.user import UserRole
 
 
+def validate_dni(v: str) -> str:
+    """Check that a DNI is exactly 11 ASCII digits (cheaper than a regex match)."""
+    if len(v) != 11 or not (v.isascii() and v.isdigit()):
+        raise ValueError("DNI must be exactly 11 digits")
+    return v
+
+
 class UserCreate(BaseModel):
     """Schema for creating a user."""
-    dni: str = Field(..., min_length=11, max_length=11, pattern=r"^\d{11}$", description="DNI/Cedula")
+    dni: str = Field(..., min_length=11, max_length=11, description="DNI/Cedula")
     password: str = Field(..., min_length=6, description="Password")
     full_name: str = Field(..., min_length=1, max_length=255, description="Full name")
     role: UserRole = Field(default=UserRole.PATIENT, description="User role")
 
+    _check_dni = field_validator("dni")(validate_dni)
+
 
 class UserResponse(BaseModel):
     """Schema for user response."""
@@ -30,6 +39,17 @@ class UserResponse(BaseModel):
             return v.value.lower()
         return v
 
+    @classmethod
+    def from_orm_fast(cls, user) -> "UserResponse":
+        """Build from a User row without re-validating already-typed ORM data."""
+        return cls.model_construct(
+            id=user.id,
+            dni=user.dni,
+            full_name=user.full_name,
+            role=user.role,
+            is_active=user.is_active,
+        )
+
 
 class StaffLoginRequest(BaseModel):
     """Schema for staff login request."""
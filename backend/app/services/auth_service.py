@@ -1,12 +1,26 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import create_access_token, get_password_hash, verify_password
+from app.exceptions import DniAlreadyRegistered
 from app.models.user import User, UserRole
 from app.repositories.user_repository import UserRepository
 from app.repositories.allowed_person_repository import AllowedPersonRepository
 
+# bcrypt releases the GIL while hashing, so a thread pool is enough to keep
+# password hashing/verification off the event loop and spread it across cores.
+_BCRYPT_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt")
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the bcrypt thread pool, without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BCRYPT_POOL, get_password_hash, password)
+
 
 class AuthService:
     """Service for authentication operations."""
@@ -21,7 +35,8 @@ class AuthService:
         user = await self.user_repo.get_by_dni(dni)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(_BCRYPT_POOL, verify_password, password, user.hashed_password):
             return None
         if not user.is_active:
             return None
@@ -35,13 +50,18 @@ class AuthService:
         role: UserRole = UserRole.PATIENT,
     ) -> User:
         """Create a new user with hashed password."""
-        # Verify DNI is in the whitelist (only for patients)
-        if role == UserRole.PATIENT:
-            is_allowed = await self.allowed_person_repo.is_dni_allowed(dni)
-            if not is_allowed:
-                raise ValueError("DNI no autorizado para registro")
+        # Hash before marking the DNI, so the row lock taken by the UPDATE is
+        # only held for the INSERT and commit, not for the whole bcrypt round
+        hashed_password = await hash_password_async(password)
+        
+        # Verify DNI is whitelisted and unused, and mark it as registered (only for patients).
+        # The mark is committed together with the new user below.
+        if role == UserRole.PATIENT and not await self.allowed_person_repo.authorize_and_mark(dni):
+            # Only failed registrations pay for telling the two cases apart
+            if await self.allowed_person_repo.is_dni_allowed(dni):
+                raise DniAlreadyRegistered("Ya existe un usuario con este DNI")
+            raise ValueError("DNI no autorizado para registro")
         
-        hashed_password = get_password_hash(password)
         user = await self.user_repo.create(
             dni=dni,
             hashed_password=hashed_password,
@@ -49,10 +69,6 @@ class AuthService:
             role=role,
         )
         
-        # Mark DNI as registered (only for patients)
-        if role == UserRole.PATIENT:
-            await self.allowed_person_repo.mark_as_registered(dni)
-        
         return user
     
     async def get_user_by_dni(self, dni: str) -> Optional[User]:
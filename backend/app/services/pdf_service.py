@@ -1,16 +1,69 @@
-from datetime import datetime, timezone
-from io import BytesIO
+import asyncio
+import time
+from functools import cache
 from pathlib import Path
+from typing import Any, Optional
 
 from fpdf import FPDF
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.repositories.medical_record_repository import MedicalRecordRepository
 from app.repositories.user_repository import UserRepository
 
 # Path to fonts directory
 FONT_DIR = Path(__file__).parent / "fonts"
 
+FONT_FILES = {
+    "": "DejaVuSans.ttf",
+    "B": "DejaVuSans-Bold.ttf",
+    "I": "DejaVuSans-Oblique.ttf",
+}
+
+
+def _type_label(entry_type: str) -> str:
+    """Human readable label for a medical record entry type."""
+    return 'Consulta' if entry_type == 'consultation' else 'Resultado de Laboratorio'
+
+
+def _truncate(value) -> str:
+    """Stringify a value and cap it at 100 characters."""
+    if isinstance(value, str):
+        return value[:100]
+    return str(value)[:100]
+
+
+def _format_results(results) -> str:
+    """Format lab results as a single line."""
+    if isinstance(results, dict):
+        # Stop formatting pairs once the joined line is past the 100 character cap
+        parts = []
+        length = -2
+        for k, v in results.items():
+            part = f"{k}: {v}"
+            parts.append(part)
+            length += len(part) + 2
+            if length >= 100:
+                break
+        return ", ".join(parts)[:100]
+    return _truncate(results)
+
+
+# (entry key, label, formatter) for each field printed per medical record entry
+_ENTRY_FIELDS = (
+    ("timestamp", "Fecha", str),
+    ("entry_type", "Tipo", _type_label),
+    ("specialty", "Especialidad", str),
+    ("doctor_name", "Doctor", str),
+    ("diagnosis", "Diagnóstico", _truncate),
+    ("notes", "Notas", _truncate),
+    ("results", "Resultados", _format_results),
+)
+
+
+@cache
+def _survey_label(key: str) -> str:
+    """Format a registration survey key as a label, e.g. "blood_type" -> "Blood Type"."""
+    return key.replace('_', ' ').title()
+
 
 class MedicalRecordPDF(FPDF):
     """Custom PDF class for medical records."""
@@ -20,11 +73,9 @@ class MedicalRecordPDF(FPDF):
         super().__init__()
         
         # Register DejaVu fonts for UTF-8 support (accents, tildes)
-        font_path = FONT_DIR / "DejaVuSans.ttf"
-        if font_path.exists():
-            self.add_font("DejaVu", "", str(font_path), uni=True)
-            self.add_font("DejaVu", "B", str(FONT_DIR / "DejaVuSans-Bold.ttf"), uni=True)
-            self.add_font("DejaVu", "I", str(FONT_DIR / "DejaVuSans-Oblique.ttf"), uni=True)
+        if (FONT_DIR / FONT_FILES[""]).exists():
+            for style, filename in FONT_FILES.items():
+                self.add_font("DejaVu", style, str(FONT_DIR / filename))
             self._font_family = "DejaVu"
         else:
             # Fallback to Helvetica if DejaVu fonts are not available
@@ -43,7 +94,7 @@ class MedicalRecordPDF(FPDF):
         self.cell(0, 10, f'Página {self.page_no()}', align='C')
 
 
-async def generate_medical_record_pdf(patient_id: int, db: AsyncSession) -> BytesIO:
+async def generate_medical_record_pdf(patient_id: int, db: AsyncSession) -> bytes:
     """
     Generate a PDF of a patient's medical record.
     
@@ -52,22 +103,48 @@ async def generate_medical_record_pdf(patient_id: int, db: AsyncSession) -> Byte
         db: Database session
         
     Returns:
-        BytesIO object containing the PDF data
+        The PDF data
     """
-    # Get patient data
+    # Get patient data together with the medical record
     user_repo = UserRepository(db)
-    patient = await user_repo.get_by_id(patient_id)
+    patient = await user_repo.get_with_record(patient_id)
     
     if not patient:
         raise ValueError(f"Patient {patient_id} not found")
     
-    # Get medical record
-    medical_record_repo = MedicalRecordRepository(db)
-    medical_record = await medical_record_repo.get_by_patient_id(patient_id)
+    medical_record = patient.medical_record
     
     if not medical_record:
         raise ValueError(f"No medical record found for patient {patient_id}")
     
+    # Rendering is CPU bound: run it in a worker thread so it doesn't block the event loop
+    return await asyncio.to_thread(
+        _render_pdf,
+        patient.full_name,
+        patient.dni,
+        medical_record.registration_survey,
+        medical_record.entries,
+        _generation_date(),
+    )
+
+
+def _generation_date() -> str:
+    """Current UTC time formatted for the PDF footer."""
+    return time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime())
+
+
+def _render_pdf(
+    full_name: str,
+    dni: str,
+    registration_survey: Optional[dict[str, Any]],
+    entries: Optional[list[dict[str, Any]]],
+    generation_date: str,
+) -> bytes:
+    """
+    Render a medical record PDF.
+    
+    Pure function of its arguments so it can run in a worker thread.
+    """
     # Create PDF
     pdf = MedicalRecordPDF()
     pdf.add_page()
@@ -76,25 +153,23 @@ async def generate_medical_record_pdf(patient_id: int, db: AsyncSession) -> Byte
     pdf.set_font(pdf._font_family, 'B', 14)
     pdf.cell(0, 10, 'Datos del Paciente', new_x='LMARGIN', new_y='NEXT')
     pdf.set_font(pdf._font_family, '', 12)
-    pdf.cell(0, 8, f'Nombre: {patient.full_name}', new_x='LMARGIN', new_y='NEXT')
-    pdf.cell(0, 8, f'DNI: {patient.dni}', new_x='LMARGIN', new_y='NEXT')
+    pdf.cell(0, 8, f'Nombre: {full_name}', new_x='LMARGIN', new_y='NEXT')
+    pdf.cell(0, 8, f'DNI: {dni}', new_x='LMARGIN', new_y='NEXT')
     pdf.ln(5)
     
     # Registration Survey
-    if medical_record.registration_survey:
+    if registration_survey:
         pdf.set_font(pdf._font_family, 'B', 14)
         pdf.cell(0, 10, 'Encuesta de Registro', new_x='LMARGIN', new_y='NEXT')
         pdf.set_font(pdf._font_family, '', 11)
         
-        survey = medical_record.registration_survey
-        for key, value in survey.items():
-            # Format key nicely
-            formatted_key = key.replace('_', ' ').title()
+        for key, value in registration_survey.items():
+            formatted_key = _survey_label(key)
             # Handle different value types
             if isinstance(value, (list, dict)):
-                value_str = str(value)[:100]  # Limit length
+                value_str = _truncate(value)  # Limit length
             else:
-                value_str = str(value)[:100] if value else "N/A"
+                value_str = _truncate(value) if value else "N/A"
             
             # Use cell instead of multi_cell to avoid wrapping issues
             try:
@@ -106,11 +181,11 @@ async def generate_medical_record_pdf(patient_id: int, db: AsyncSession) -> Byte
         pdf.ln(5)
     
     # Medical History Entries
-    if medical_record.entries:
+    if entries:
         pdf.set_font(pdf._font_family, 'B', 14)
         pdf.cell(0, 10, 'Historial de Consultas y Laboratorios', new_x='LMARGIN', new_y='NEXT')
         
-        for idx, entry in enumerate(medical_record.entries, 1):
+        for idx, entry in enumerate(entries, 1):
             pdf.set_font(pdf._font_family, 'B', 12)
             pdf.cell(0, 8, f'Entrada #{idx}', new_x='LMARGIN', new_y='NEXT')
             
@@ -118,35 +193,10 @@ async def generate_medical_record_pdf(patient_id: int, db: AsyncSession) -> Byte
             
             # Entry details
             try:
-                if 'timestamp' in entry:
-                    pdf.cell(0, 6, f"Fecha: {entry['timestamp']}", new_x='LMARGIN', new_y='NEXT')
-                
-                if 'entry_type' in entry:
-                    entry_type = entry['entry_type']
-                    type_label = 'Consulta' if entry_type == 'consultation' else 'Resultado de Laboratorio'
-                    pdf.cell(0, 6, f"Tipo: {type_label}", new_x='LMARGIN', new_y='NEXT')
-                
-                if 'specialty' in entry and entry['specialty']:
-                    pdf.cell(0, 6, f"Especialidad: {entry['specialty']}", new_x='LMARGIN', new_y='NEXT')
-                
-                if 'doctor_name' in entry and entry['doctor_name']:
-                    pdf.cell(0, 6, f"Doctor: {entry['doctor_name']}", new_x='LMARGIN', new_y='NEXT')
-                
-                if 'diagnosis' in entry and entry['diagnosis']:
-                    diag_text = str(entry['diagnosis'])[:100]
-                    pdf.cell(0, 6, f"Diagnóstico: {diag_text}", new_x='LMARGIN', new_y='NEXT')
-                
-                if 'notes' in entry and entry['notes']:
-                    notes_text = str(entry['notes'])[:100]
-                    pdf.cell(0, 6, f"Notas: {notes_text}", new_x='LMARGIN', new_y='NEXT')
-                
-                if 'results' in entry and entry['results']:
-                    # Format results dict nicely
-                    if isinstance(entry['results'], dict):
-                        results_text = "Resultados: " + ", ".join([f"{k}: {v}" for k, v in entry['results'].items()])[:100]
-                    else:
-                        results_text = f"Resultados: {str(entry['results'])[:100]}"
-                    pdf.cell(0, 6, results_text, new_x='LMARGIN', new_y='NEXT')
+                for key, label, fmt in _ENTRY_FIELDS:
+                    value = entry.get(key)
+                    if value:
+                        pdf.cell(0, 6, f"{label}: {fmt(value)}", new_x='LMARGIN', new_y='NEXT')
             except Exception:
                 # If any field fails, skip it
                 pass
@@ -156,13 +206,6 @@ async def generate_medical_record_pdf(patient_id: int, db: AsyncSession) -> Byte
     # Footer with generation date
     pdf.ln(10)
     pdf.set_font(pdf._font_family, 'I', 10)
-    generation_date = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
     pdf.cell(0, 8, f'Fecha de generación: {generation_date}', align='R', new_x='LMARGIN', new_y='NEXT')
     
-    # Output to BytesIO
-    pdf_bytes = BytesIO()
-    pdf_output = pdf.output()
-    pdf_bytes.write(pdf_output)
-    pdf_bytes.seek(0)
-    
-    return pdf_bytes
+    return bytes(pdf.output())
@@ -1,5 +1,5 @@
-from datetime import datetime, timedelta, time as dt_time
-from typing import List, Union, Optional
+from datetime import datetime, timedelta
+from typing import List
 
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -8,9 +8,16 @@ from app.models.category_schedule import CategorySchedule, RotationType
 from app.models.appointment import Appointment, AppointmentStatus
 
 
+# Appointment statuses that take up a slot
+ACTIVE_APPOINTMENT_STATUSES = (AppointmentStatus.SCHEDULED, AppointmentStatus.CONFIRMED)
+
+
 class TimeSlot:
     """Represents an available time slot."""
     
+    # Many slots are built per search; no per-instance __dict__
+    __slots__ = ("slot_datetime", "category_name", "category_id", "warning_message", "deadline_time")
+    
     def __init__(self, slot_datetime: datetime, category_name: str, category_id: int, 
                  warning_message: str = None, deadline_time: str = None):
         self.slot_datetime = slot_datetime
@@ -53,66 +60,111 @@ class ScheduleService:
             List of the next available TimeSlot objects
         """
         all_available_slots = []
-        start_date = datetime.now()
+        # One clock read serves both the search start and the past-slot cutoff
+        now = datetime.now()
+        start_date = now
         
         # Fetch all schedules for this category name and type
-        result = await self.session.execute(
-            select(CategorySchedule).where(
-                and_(
-                    CategorySchedule.name == category_name,
-                    CategorySchedule.category_type == category_type
-                )
-            )
-        )
-        schedules = result.scalars().all()
+        schedules = await self._get_schedules(category_name, category_type)
         
         if not schedules:
             return []
 
         # Optimize: Map day_of_week to schedules for faster lookup
         schedules_by_day = {s.day_of_week: s for s in schedules}
-        valid_days = set(schedules_by_day.keys())
         
-        # We'll search up to 60 days ahead to find slots (prevent infinite loop)
-        days_searched = 0
-        current_date_cursor = start_date
-
-        while len(all_available_slots) < limit and days_searched < 60:
-            # Check if current weekday is in our valid schedule days
-            if current_date_cursor.weekday() in valid_days:
-                category = schedules_by_day[current_date_cursor.weekday()]
-                
-                if self._is_schedule_active(category, current_date_cursor):
-                    slots = self._generate_slots(category, current_date_cursor)
-                    
-                    # Filter out past slots if looking at today
-                    if current_date_cursor.date() == datetime.now().date():
-                        now = datetime.now()
-                        slots = [s for s in slots if s.slot_datetime > now]
-                    
-                    if slots:
-                        available_slots = await self._filter_occupied_slots(slots, category.name)
-                        # BUG FIX: Only take the first available slot for this day
-                        if available_slots:
-                            all_available_slots.append(available_slots[0])
+        # Only days whose weekday has a schedule block can have slots: step
+        # through the search window (up to 60 days ahead) a week at a time
+        # from each block's first matching day instead of visiting every day
+        start_ordinal = start_date.toordinal()
+        start_weekday = start_date.weekday()
+        candidate_days = []
+        for day_of_week, category in schedules_by_day.items():
+            anchor_ordinal = self._anchor_ordinal(category)
+            candidate_days.extend(
+                (offset, category)
+                for offset in range((day_of_week - start_weekday) % 7, 60, 7)
+                if self._is_schedule_active(category, anchor_ordinal, start_ordinal + offset)
+            )
+        candidate_days.sort(key=lambda day: day[0])
+        
+        # Collect the candidate slots of every active day first, so occupancy
+        # is checked in batches of days instead of with one query per day
+        slots_by_day: List[List[TimeSlot]] = []
+        for offset, category in candidate_days:
+            current_date_cursor = start_date + timedelta(days=offset)
+            
+            slots = self._generate_slots(category, current_date_cursor)
             
-            # Move to next day
-            current_date_cursor += timedelta(days=1)
-            days_searched += 1
+            # Filter out past slots if looking at today
+            if offset == 0:
+                slots = [s for s in slots if s.slot_datetime > now]
             
-            # If we collected more than we need, trim list (though we append one by one now)
-            if len(all_available_slots) >= limit:
-                break
+            if slots:
+                slots_by_day.append(slots)
+        
+        # Each day yields at most one slot, so only the next (limit - found)
+        # days can be needed: check occupancy for just those, and only move
+        # on to later days if some of them turn out to be fully booked
+        day_index = 0
+        while day_index < len(slots_by_day) and len(all_available_slots) < limit:
+            batch = slots_by_day[day_index:day_index + limit - len(all_available_slots)]
+            day_index += len(batch)
+            
+            occupied_datetimes = await self._get_occupied_datetimes(
+                category_name,
+                batch[0][0].slot_datetime,
+                batch[-1][-1].slot_datetime,
+            )
+            
+            for slots in batch:
+                # BUG FIX: Only take the first available slot for this day
+                for slot in slots:
+                    if slot.slot_datetime not in occupied_datetimes:
+                        all_available_slots.append(slot)
+                        break
         
         return all_available_slots
     
-    def _is_schedule_active(self, category: CategorySchedule, date: datetime) -> bool:
+    async def _get_schedules(self, category_name: str, category_type: str) -> List[CategorySchedule]:
+        """
+        Get the schedule blocks of a category.
+        
+        Args:
+            category_name: The name of the category
+            category_type: The type of the category
+        
+        Returns:
+            List of CategorySchedule rows (empty if the category has none)
+        """
+        result = await self.session.execute(
+            select(CategorySchedule).where(
+                and_(
+                    CategorySchedule.name == category_name,
+                    CategorySchedule.category_type == category_type
+                )
+            )
+        )
+        return list(result.scalars().all())
+    
+    def _anchor_ordinal(self, category: CategorySchedule) -> int:
+        """Ordinal of the date a schedule's alternating rotation counts weeks from."""
+        # Use category-specific start date if available, otherwise fallback to global anchor
+        anchor_date = category.start_date if category.start_date else self.ANCHOR_DATE.date()
+        
+        # Ensure we are comparing dates
+        if isinstance(anchor_date, datetime):
+            anchor_date = anchor_date.date()
+        return anchor_date.toordinal()
+    
+    def _is_schedule_active(self, category: CategorySchedule, anchor_ordinal: int, day_ordinal: int) -> bool:
         """
         Determine if a schedule is active on a given date based on rotation type.
         
         Args:
             category: The category schedule
-            date: The date to check
+            anchor_ordinal: The schedule's rotation anchor, see _anchor_ordinal()
+            day_ordinal: The date to check, as date.toordinal()
         
         Returns:
             True if the schedule is active on this date, False otherwise
@@ -123,26 +175,16 @@ class ScheduleService:
         
         elif category.rotation_type == RotationType.ALTERNATED:
             # ALTERNATED schedules use week-based rotation
-            # Use category-specific start date if available, otherwise fallback to global anchor
-            anchor_date = category.start_date if category.start_date else self.ANCHOR_DATE.date()
-            
-            # Ensure we are comparing dates
-            if isinstance(anchor_date, datetime):
-                anchor_date = anchor_date.date()
-                
-            # Calculate week number from anchor date
-            days_since_anchor = (date.date() - anchor_date).days
+            days_since_anchor = day_ordinal - anchor_ordinal
             
             # For dates before anchor, treat as inactive
             if days_since_anchor < 0:
                 return False
             
-            weeks_since_anchor = days_since_anchor // 7
-            
             # Check if this week matches the rotation pattern
             # The schedule is active when: (current_week - anchor_week) % rotation_weeks == 0
             if category.rotation_weeks > 1:
-                return (weeks_since_anchor % category.rotation_weeks) == 0
+                return (days_since_anchor // 7) % category.rotation_weeks == 0
             return True # Should not happen for alternating schedules with weeks=1, but fallback to True
         
         return False
@@ -158,75 +200,54 @@ class ScheduleService:
         Returns:
             List of TimeSlot objects representing all possible slots
         """
-        slots = []
-        
         # Combine date with start time
-        current_time = datetime.combine(date.date(), category.start_time)
+        start = datetime.combine(date.date(), category.start_time)
+        # Each turn starts turn_duration minutes after the previous one
+        step = timedelta(minutes=category.turn_duration)
         
         # Get warning message and deadline time from category
         warning_message = category.warning_message
         deadline_time = category.deadline_time.strftime("%H:%M") if category.deadline_time else None
         
-        # Generate slots by adding turn_duration repeatedly
-        for turn_number in range(category.max_turns_per_block):
-            slot = TimeSlot(
-                slot_datetime=current_time,
+        slots = [
+            TimeSlot(
+                slot_datetime=start + turn_number * step,
                 category_name=category.name,
                 category_id=category.id,
                 warning_message=warning_message,
                 deadline_time=deadline_time
             )
-            slots.append(slot)
-            
-            # Add turn_duration (in minutes) to get the next slot
-            current_time = current_time + timedelta(minutes=category.turn_duration)
+            for turn_number in range(category.max_turns_per_block)
+        ]
         
         return slots
     
-    async def _filter_occupied_slots(
-        self, 
-        slots: List[TimeSlot], 
-        category_name: str
-    ) -> List[TimeSlot]:
+    async def _get_occupied_datetimes(
+        self,
+        category_name: str,
+        first_slot: datetime,
+        last_slot: datetime,
+    ) -> set[datetime]:
         """
-        Filter out time slots that are already occupied by appointments.
+        Get the datetimes already taken by active appointments of a category.
         
         Args:
-            slots: List of all potential time slots
             category_name: The name of the category (used to match with appointment.specialty)
+            first_slot: Earliest slot datetime to check
+            last_slot: Latest slot datetime to check
         
         Returns:
-            List of available (non-occupied) TimeSlot objects
+            Set of appointment datetimes in [first_slot, last_slot]
         """
-        if not slots:
-            return []
-        
-        # Get all slot datetimes
-        slot_datetimes = [slot.slot_datetime for slot in slots]
-        
-        # Query appointments that match these datetimes AND the category specialty
-        # This ensures we only block slots for appointments of the same category
+        # Only appointments of the same category block a slot
         result = await self.session.execute(
-            select(Appointment).where(
+            select(Appointment.appointment_date).where(
                 and_(
-                    Appointment.appointment_date.in_(slot_datetimes),
+                    Appointment.appointment_date >= first_slot,
+                    Appointment.appointment_date <= last_slot,
                     Appointment.specialty == category_name,
-                    Appointment.status.in_([
-                        AppointmentStatus.SCHEDULED,
-                        AppointmentStatus.CONFIRMED
-                    ])
+                    Appointment.status.in_(ACTIVE_APPOINTMENT_STATUSES)
                 )
             )
         )
-        occupied_appointments = result.scalars().all()
-        
-        # Create a set of occupied datetimes for fast lookup
-        occupied_datetimes = {appt.appointment_date for appt in occupied_appointments}
-        
-        # Filter out occupied slots
-        available_slots = [
-            slot for slot in slots 
-            if slot.slot_datetime not in occupied_datetimes
-        ]
-        
-        return available_slots
+        return set(result.scalars().all())
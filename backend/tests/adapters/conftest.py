@@ -0,0 +1,54 @@
+from typing import Any, Generator, Optional
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+class StubCursor:
+    """Cursor stand-in: ``execute`` records its calls and ``fetchone`` returns ``row``."""
+
+    def __init__(self) -> None:
+        self.row: Optional[tuple] = None
+        self.description: tuple = ()
+        self.execute = MagicMock()
+
+    def fetchone(self) -> Optional[tuple]:
+        return self.row
+
+    def __enter__(self) -> "StubCursor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+class StubConnection:
+    """Connection stand-in whose context manager records that it was exited."""
+
+    def __init__(self, cursor: StubCursor) -> None:
+        self._cursor = cursor
+        self.exited = False
+
+    def cursor(self) -> StubCursor:
+        return self._cursor
+
+    def __enter__(self) -> "StubConnection":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.exited = True
+        return None
+
+
+@pytest.fixture
+def mock_oracle_conn() -> Generator[tuple[MagicMock, StubCursor, StubConnection], None, None]:
+    """Patch oracledb.connect to return a stub connection wrapping a stub cursor.
+
+    Yields (mock_connect, cursor, connection); tests only need to set the
+    cursor's row, description or execute side effect.
+    """
+    cursor = StubCursor()
+    connection = StubConnection(cursor)
+
+    with patch('app.adapters.oracle_adapter.oracledb.connect', return_value=connection) as mock_connect:
+        yield mock_connect, cursor, connection
@@ -4,14 +4,21 @@ These tests use mocks to avoid connecting to a real Oracle database.
 All database interactions are strictly mocked to ensure tests are fast,
 reliable, and don't depend on external services.
 """
+import oracledb
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import ANY, patch
 from datetime import datetime
 
 from app.adapters.oracle_adapter import OracleAdapter
 from app.schemas.legacy import PatientHistory
 from app.exceptions import ServiceUnavailable
 
+# Column descriptions of the legacy patient query
+_ORACLE_COLUMN_DESC = (
+    ('DNI',), ('FULL_NAME',), ('BIRTH_DATE',), ('BLOOD_TYPE',),
+    ('ALLERGIES',), ('MEDICATIONS',), ('MEDICAL_HISTORY',), ('LAST_VISIT',)
+)
+
 
 class TestOracleAdapter:
     """Test suite for OracleAdapter class."""
@@ -53,51 +60,34 @@ class TestOracleAdapter:
         with pytest.raises(ValueError, match="Oracle credentials not provided"):
             OracleAdapter()
     
-    @patch('app.adapters.oracle_adapter.oracledb.connect')
-    def test_connection_failure_raises_service_unavailable(
-        self,
-        mock_connect,
-        adapter
-    ):
+    def test_connection_failure_raises_service_unavailable(self, adapter, mock_oracle_conn):
         """Test that connection failures raise ServiceUnavailable exception.
         
         This verifies that Oracle-specific errors are abstracted away
         and the application receives a generic ServiceUnavailable exception.
         """
-        import oracledb
-        
         # Simulate connection failure
+        mock_connect, _, _ = mock_oracle_conn
         mock_connect.side_effect = oracledb.Error("Connection timeout")
         
         with pytest.raises(ServiceUnavailable, match="Failed to connect to Oracle database"):
             adapter.get_patient_history("12345678")
     
-    @patch('app.adapters.oracle_adapter.oracledb.connect')
-    def test_empty_result_returns_none(self, mock_connect, adapter):
+    def test_empty_result_returns_none(self, adapter, mock_oracle_conn):
         """Test that empty query results return None.
         
         When a patient is not found in the database, the adapter
         should return None rather than raising an exception.
         """
-        # Create mock connection and cursor
-        mock_cursor = MagicMock()
-        mock_cursor.fetchone.return_value = None
-        
-        mock_connection = MagicMock()
-        mock_connection.__enter__.return_value = mock_connection
-        mock_connection.__exit__.return_value = None
-        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
-        mock_connection.cursor.return_value.__exit__.return_value = None
-        
-        mock_connect.return_value = mock_connection
+        _, mock_cursor, _ = mock_oracle_conn
+        mock_cursor.row = None
         
         result = adapter.get_patient_history("99999999")
         
         assert result is None
         mock_cursor.execute.assert_called_once()
     
-    @patch('app.adapters.oracle_adapter.oracledb.connect')
-    def test_successful_patient_retrieval(self, mock_connect, adapter):
+    def test_successful_patient_retrieval(self, adapter, mock_oracle_conn):
         """Test successful retrieval of patient data from Oracle database."""
         # Mock database row
         mock_row = (
@@ -111,25 +101,9 @@ class TestOracleAdapter:
             datetime(2023, 12, 1)  # last_visit
         )
         
-        # Mock column descriptions
-        mock_description = [
-            ('DNI',), ('FULL_NAME',), ('BIRTH_DATE',), ('BLOOD_TYPE',),
-            ('ALLERGIES',), ('MEDICATIONS',), ('MEDICAL_HISTORY',), ('LAST_VISIT',)
-        ]
-        
-        # Create mock cursor
-        mock_cursor = MagicMock()
-        mock_cursor.fetchone.return_value = mock_row
-        mock_cursor.description = mock_description
-        
-        # Create mock connection
-        mock_connection = MagicMock()
-        mock_connection.__enter__.return_value = mock_connection
-        mock_connection.__exit__.return_value = None
-        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
-        mock_connection.cursor.return_value.__exit__.return_value = None
-        
-        mock_connect.return_value = mock_connection
+        _, mock_cursor, _ = mock_oracle_conn
+        mock_cursor.row = mock_row
+        mock_cursor.description = _ORACLE_COLUMN_DESC
         
         # Execute
         result = adapter.get_patient_history("12345678")
@@ -147,42 +121,31 @@ class TestOracleAdapter:
         assert result.last_visit == datetime(2023, 12, 1)
         
         # Verify query was executed with correct DNI
-        mock_cursor.execute.assert_called_once()
-        call_args = mock_cursor.execute.call_args
-        assert 'dni' in call_args[0][1]
-        assert call_args[0][1]['dni'] == '12345678'
+        mock_cursor.execute.assert_called_once_with(ANY, {'dni': '12345678'})
     
-    @patch('app.adapters.oracle_adapter.oracledb.connect')
-    def test_connection_context_manager_closes_on_error(self, mock_connect, adapter):
+    def test_connection_context_manager_closes_on_error(self, adapter, mock_oracle_conn):
         """Test that connections are properly closed even when errors occur.
         
         This verifies that the context manager pattern ensures resources
         are cleaned up even in error scenarios.
         """
-        import oracledb
-        
-        # Create a mock connection that raises an error during query
-        mock_cursor = MagicMock()
+        # Make the query raise an error
+        _, mock_cursor, mock_connection = mock_oracle_conn
         mock_cursor.execute.side_effect = oracledb.Error("Query execution failed")
         
-        mock_connection = MagicMock()
-        mock_connection.__enter__.return_value = mock_connection
-        mock_connection.__exit__.return_value = None
-        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
-        mock_connection.cursor.return_value.__exit__.return_value = None
-        
-        mock_connect.return_value = mock_connection
-        
         # Attempt to get patient history
         with pytest.raises(ServiceUnavailable):
             adapter.get_patient_history("12345678")
         
         # Verify context manager's __exit__ was called
-        mock_connection.__exit__.assert_called()
+        assert mock_connection.exited
     
-    @patch('app.adapters.oracle_adapter.oracledb.connect')
-    def test_empty_allergies_and_medications(self, mock_connect, adapter):
-        """Test handling of empty/null allergies and medications fields."""
+    def test_empty_allergies_and_medications(self, adapter):
+        """Test handling of empty/null allergies and medications fields.
+        
+        Parses the row directly: the query path is covered by
+        test_successful_patient_retrieval.
+        """
         mock_row = (
             '12345678',
             'Jane Smith',
@@ -194,25 +157,7 @@ class TestOracleAdapter:
             datetime(2024, 1, 10)
         )
         
-        mock_description = [
-            ('DNI',), ('FULL_NAME',), ('BIRTH_DATE',), ('BLOOD_TYPE',),
-            ('ALLERGIES',), ('MEDICATIONS',), ('MEDICAL_HISTORY',), ('LAST_VISIT',)
-        ]
-        
-        mock_cursor = MagicMock()
-        mock_cursor.fetchone.return_value = mock_row
-        mock_cursor.description = mock_description
-        
-        mock_connection = MagicMock()
-        mock_connection.__enter__.return_value = mock_connection
-        mock_connection.__exit__.return_value = None
-        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
-        mock_connection.cursor.return_value.__exit__.return_value = None
+        result = adapter._row_to_patient_history(mock_row, _ORACLE_COLUMN_DESC)
         
-        mock_connect.return_value = mock_connection
-        
-        result = adapter.get_patient_history("12345678")
-        
-        assert result is not None
         assert result.allergies == []
         assert result.medications == []
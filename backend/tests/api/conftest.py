@@ -0,0 +1,25 @@
+import pytest
+
+from app.main import ALLOWED_HOSTS, app
+
+
+@pytest.fixture(scope="session")
+def middleware_classes() -> list[type]:
+    """Classes of the app's user middleware stack, in the order they were added."""
+    return [m.cls for m in app.user_middleware]
+
+
+@pytest.fixture(scope="session")
+def allowed_hosts() -> list[str]:
+    """Hosts the TrustedHostMiddleware was configured with."""
+    return ALLOWED_HOSTS
+
+
+STAFF_PASSWORD = "correct-staff-password"
+
+
+@pytest.fixture
+def staff_password(monkeypatch: pytest.MonkeyPatch) -> str:
+    """Set the configured staff password for the test and return it."""
+    monkeypatch.setattr("app.api.endpoints.auth.settings.STAFF_PASSWORD", STAFF_PASSWORD)
+    return STAFF_PASSWORD
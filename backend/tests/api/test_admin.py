@@ -1,101 +1,158 @@
 import pytest
 from datetime import time
 from httpx import AsyncClient
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.category_schedule import CategorySchedule, CategoryType, RotationType
 
+ADMIN_PASSWORD = "correct-admin-password"
+
+
+@pytest.fixture(autouse=True)
+def admin_password(monkeypatch: pytest.MonkeyPatch) -> str:
+    """Set the configured admin password schedule writes are authorized with, and return it."""
+    monkeypatch.setattr("app.api.endpoints.auth.settings.ADMIN_PASSWORD", ADMIN_PASSWORD)
+    return ADMIN_PASSWORD
+
+
+def _schedule_payload(**overrides) -> dict:
+    """A valid POST /admin/schedules body with the given fields replaced."""
+    payload = {
+        "admin_password": ADMIN_PASSWORD,
+        "category_type": "specialty",
+        "name": "Cardiology",
+        "day_of_week": 0,  # Monday
+        "start_time": "09:00:00",
+        "turn_duration": 30,
+        "max_turns_per_block": 4,
+        "rotation_type": "fixed",
+        "rotation_weeks": 1,
+    }
+    payload.update(overrides)
+    return payload
+
+
+# rotation_weeks not specified, should default to 1
+_DEFAULT_ROTATION_PAYLOAD = {
+    field: value
+    for field, value in _schedule_payload(
+        name="Orthopedics",
+        day_of_week=3,
+        start_time="11:00:00",
+        turn_duration=40,
+        max_turns_per_block=5,
+    ).items()
+    if field != "rotation_weeks"
+}
+
 
 @pytest.mark.asyncio
-async def test_create_schedule_specialty(client: AsyncClient, test_db: AsyncSession):
-    """Test creating a new specialty schedule."""
-    response = await client.post(
-        "/admin/schedules",
-        json={
-            "category_type": "specialty",
-            "name": "Cardiology",
-            "day_of_week": 0,  # Monday
-            "start_time": "09:00:00",
-            "turn_duration": 30,
-            "max_turns_per_block": 4,
-            "rotation_type": "fixed",
-            "rotation_weeks": 1,
-        },
-    )
+@pytest.mark.parametrize(
+    "payload, expected_status, expected_fields",
+    [
+        pytest.param(
+            _schedule_payload(),
+            201,
+            {
+                "category_type": "specialty",
+                "name": "Cardiology",
+                "day_of_week": 0,
+                "start_time": "09:00:00",
+                "turn_duration": 30,
+                "max_turns_per_block": 4,
+                "rotation_type": "fixed",
+                "rotation_weeks": 1,
+            },
+            id="specialty",
+        ),
+        pytest.param(
+            _schedule_payload(
+                category_type="laboratory",
+                name="Blood Test",
+                day_of_week=2,  # Wednesday
+                start_time="08:00:00",
+                turn_duration=15,
+                max_turns_per_block=8,
+                rotation_type="alternated",
+                rotation_weeks=2,
+            ),
+            201,
+            {
+                "category_type": "laboratory",
+                "name": "Blood Test",
+                "day_of_week": 2,
+                "rotation_type": "alternated",
+                "rotation_weeks": 2,
+            },
+            id="laboratory",
+        ),
+        pytest.param(_DEFAULT_ROTATION_PAYLOAD, 201, {"rotation_weeks": 1}, id="default_rotation_weeks"),
+        # Validation errors: day_of_week must be 0-6, turn_duration > 0
+        pytest.param(_schedule_payload(day_of_week=7), 422, {}, id="invalid_day_of_week"),
+        pytest.param(_schedule_payload(turn_duration=0), 422, {}, id="invalid_turn_duration"),
+    ],
+)
+async def test_create_schedule(
+    client: AsyncClient,
+    test_db: AsyncSession,
+    payload: dict,
+    expected_status: int,
+    expected_fields: dict,
+):
+    """Test creating schedules, and rejecting invalid ones, through POST /admin/schedules."""
+    response = await client.post("/admin/schedules", json=payload)
     
-    assert response.status_code == 201
-    data = response.json()
-    assert data["category_type"] == "specialty"
-    assert data["name"] == "Cardiology"
-    assert data["day_of_week"] == 0
-    assert data["start_time"] == "09:00:00"
-    assert data["turn_duration"] == 30
-    assert data["max_turns_per_block"] == 4
-    assert data["rotation_type"] == "fixed"
-    assert data["rotation_weeks"] == 1
-    assert "id" in data
+    assert response.status_code == expected_status
+    if expected_status == 201:
+        data = response.json()
+        for field, value in expected_fields.items():
+            assert data[field] == value
+        assert "id" in data
 
 
 @pytest.mark.asyncio
-async def test_create_schedule_laboratory(client: AsyncClient, test_db: AsyncSession):
-    """Test creating a new laboratory schedule."""
-    response = await client.post(
-        "/admin/schedules",
-        json={
-            "category_type": "laboratory",
-            "name": "Blood Test",
-            "day_of_week": 2,  # Wednesday
-            "start_time": "08:00:00",
-            "turn_duration": 15,
-            "max_turns_per_block": 8,
-            "rotation_type": "alternated",
-            "rotation_weeks": 2,
-        },
-    )
+async def test_create_schedule_wrong_admin_password(client: AsyncClient, test_db: AsyncSession):
+    """Test that an otherwise valid schedule is rejected without the admin password."""
+    response = await client.post("/admin/schedules", json=_schedule_payload(admin_password="wrong"))
     
-    assert response.status_code == 201
-    data = response.json()
-    assert data["category_type"] == "laboratory"
-    assert data["name"] == "Blood Test"
-    assert data["day_of_week"] == 2
-    assert data["rotation_type"] == "alternated"
-    assert data["rotation_weeks"] == 2
+    assert response.status_code == 401
+    
+    # Nothing was stored
+    list_response = await client.get("/admin/schedules")
+    assert list_response.json() == []
 
 
 @pytest.mark.asyncio
 async def test_update_existing_schedule(client: AsyncClient, test_db: AsyncSession):
-    """Test updating an existing schedule (same category_type and day_of_week)."""
+    """Test updating an existing schedule (same category name and day_of_week)."""
     # Create initial schedule
     initial_response = await client.post(
         "/admin/schedules",
-        json={
-            "category_type": "specialty",
-            "name": "Neurology",
-            "day_of_week": 1,  # Tuesday
-            "start_time": "10:00:00",
-            "turn_duration": 45,
-            "max_turns_per_block": 3,
-            "rotation_type": "fixed",
-            "rotation_weeks": 1,
-        },
+        json=_schedule_payload(
+            name="Neurology",
+            day_of_week=1,  # Tuesday
+            start_time="10:00:00",
+            turn_duration=45,
+            max_turns_per_block=3,
+        ),
     )
     assert initial_response.status_code == 201
     initial_data = initial_response.json()
     schedule_id = initial_data["id"]
     
-    # Update with different values but same category_type and day_of_week
+    # Update with different values but same category name and day_of_week
     update_response = await client.post(
         "/admin/schedules",
-        json={
-            "category_type": "specialty",
-            "name": "Neurology Advanced",  # Updated name
-            "day_of_week": 1,  # Same Tuesday
-            "start_time": "14:00:00",  # Updated time
-            "turn_duration": 60,  # Updated duration
-            "max_turns_per_block": 5,  # Updated max turns
-            "rotation_type": "alternated",  # Updated rotation
-            "rotation_weeks": 2,  # Updated weeks
-        },
+        json=_schedule_payload(
+            name="Neurology",  # Same name
+            day_of_week=1,  # Same Tuesday
+            start_time="14:00:00",  # Updated time
+            turn_duration=60,  # Updated duration
+            max_turns_per_block=5,  # Updated max turns
+            rotation_type="alternated",  # Updated rotation
+            rotation_weeks=2,  # Updated weeks
+        ),
     )
     
     assert update_response.status_code == 201
@@ -103,7 +160,7 @@ async def test_update_existing_schedule(client: AsyncClient, test_db: AsyncSessi
     
     # Should have the same ID (updated, not created new)
     assert updated_data["id"] == schedule_id
-    assert updated_data["name"] == "Neurology Advanced"
+    assert updated_data["name"] == "Neurology"
     assert updated_data["start_time"] == "14:00:00"
     assert updated_data["turn_duration"] == 60
     assert updated_data["max_turns_per_block"] == 5
@@ -117,32 +174,21 @@ async def test_different_category_types_same_day(client: AsyncClient, test_db: A
     # Create specialty schedule for Monday
     specialty_response = await client.post(
         "/admin/schedules",
-        json={
-            "category_type": "specialty",
-            "name": "Dermatology",
-            "day_of_week": 0,  # Monday
-            "start_time": "09:00:00",
-            "turn_duration": 30,
-            "max_turns_per_block": 4,
-            "rotation_type": "fixed",
-            "rotation_weeks": 1,
-        },
+        json=_schedule_payload(name="Dermatology"),  # Monday
     )
     assert specialty_response.status_code == 201
     
     # Create laboratory schedule for Monday (different category_type)
     lab_response = await client.post(
         "/admin/schedules",
-        json={
-            "category_type": "laboratory",
-            "name": "X-Ray",
-            "day_of_week": 0,  # Monday (same day)
-            "start_time": "08:00:00",
-            "turn_duration": 20,
-            "max_turns_per_block": 6,
-            "rotation_type": "fixed",
-            "rotation_weeks": 1,
-        },
+        json=_schedule_payload(
+            category_type="laboratory",
+            name="X-Ray",
+            day_of_week=0,  # Monday (same day)
+            start_time="08:00:00",
+            turn_duration=20,
+            max_turns_per_block=6,
+        ),
     )
     assert lab_response.status_code == 201
     
@@ -168,43 +214,43 @@ async def test_list_schedules_empty(client: AsyncClient, test_db: AsyncSession):
 @pytest.mark.asyncio
 async def test_list_schedules_with_data(client: AsyncClient, test_db: AsyncSession):
     """Test listing all schedules."""
-    # Create multiple schedules
-    schedules_to_create = [
-        {
-            "category_type": "specialty",
-            "name": "Cardiology",
-            "day_of_week": 0,
-            "start_time": "09:00:00",
-            "turn_duration": 30,
-            "max_turns_per_block": 4,
-            "rotation_type": "fixed",
-            "rotation_weeks": 1,
-        },
-        {
-            "category_type": "specialty",
-            "name": "Neurology",
-            "day_of_week": 1,
-            "start_time": "10:00:00",
-            "turn_duration": 45,
-            "max_turns_per_block": 3,
-            "rotation_type": "fixed",
-            "rotation_weeks": 1,
-        },
-        {
-            "category_type": "laboratory",
-            "name": "Blood Test",
-            "day_of_week": 2,
-            "start_time": "08:00:00",
-            "turn_duration": 15,
-            "max_turns_per_block": 8,
-            "rotation_type": "alternated",
-            "rotation_weeks": 2,
-        },
-    ]
-    
-    for schedule_data in schedules_to_create:
-        create_response = await client.post("/admin/schedules", json=schedule_data)
-        assert create_response.status_code == 201
+    # Insert the schedules directly: only the listing endpoint is under test
+    await test_db.execute(
+        insert(CategorySchedule),
+        [
+            {
+                "category_type": CategoryType.SPECIALTY,
+                "name": "Cardiology",
+                "day_of_week": 0,
+                "start_time": time(9, 0),
+                "turn_duration": 30,
+                "max_turns_per_block": 4,
+                "rotation_type": RotationType.FIXED,
+                "rotation_weeks": 1,
+            },
+            {
+                "category_type": CategoryType.SPECIALTY,
+                "name": "Neurology",
+                "day_of_week": 1,
+                "start_time": time(10, 0),
+                "turn_duration": 45,
+                "max_turns_per_block": 3,
+                "rotation_type": RotationType.FIXED,
+                "rotation_weeks": 1,
+            },
+            {
+                "category_type": CategoryType.LABORATORY,
+                "name": "Blood Test",
+                "day_of_week": 2,
+                "start_time": time(8, 0),
+                "turn_duration": 15,
+                "max_turns_per_block": 8,
+                "rotation_type": RotationType.ALTERNATED,
+                "rotation_weeks": 2,
+            },
+        ],
+    )
+    await test_db.commit()
     
     # List all schedules
     list_response = await client.get("/admin/schedules")
@@ -222,65 +268,3 @@ async def test_list_schedules_with_data(client: AsyncClient, test_db: AsyncSessi
     assert data[1]["day_of_week"] == 0
     assert data[2]["category_type"] == "specialty"
     assert data[2]["day_of_week"] == 1
-
-
-@pytest.mark.asyncio
-async def test_create_schedule_invalid_day_of_week(client: AsyncClient):
-    """Test creating schedule with invalid day_of_week."""
-    response = await client.post(
-        "/admin/schedules",
-        json={
-            "category_type": "specialty",
-            "name": "Cardiology",
-            "day_of_week": 7,  # Invalid (should be 0-6)
-            "start_time": "09:00:00",
-            "turn_duration": 30,
-            "max_turns_per_block": 4,
-            "rotation_type": "fixed",
-            "rotation_weeks": 1,
-        },
-    )
-    
-    assert response.status_code == 422  # Validation error
-
-
-@pytest.mark.asyncio
-async def test_create_schedule_invalid_turn_duration(client: AsyncClient):
-    """Test creating schedule with invalid turn_duration."""
-    response = await client.post(
-        "/admin/schedules",
-        json={
-            "category_type": "specialty",
-            "name": "Cardiology",
-            "day_of_week": 0,
-            "start_time": "09:00:00",
-            "turn_duration": 0,  # Invalid (should be > 0)
-            "max_turns_per_block": 4,
-            "rotation_type": "fixed",
-            "rotation_weeks": 1,
-        },
-    )
-    
-    assert response.status_code == 422  # Validation error
-
-
-@pytest.mark.asyncio
-async def test_create_schedule_default_rotation_weeks(client: AsyncClient, test_db: AsyncSession):
-    """Test creating schedule with default rotation_weeks."""
-    response = await client.post(
-        "/admin/schedules",
-        json={
-            "category_type": "specialty",
-            "name": "Orthopedics",
-            "day_of_week": 3,
-            "start_time": "11:00:00",
-            "turn_duration": 40,
-            "max_turns_per_block": 5,
-            "rotation_type": "fixed",
-            # rotation_weeks not specified, should default to 1
-        },
-    )
-    
-    assert response.status_code == 201
-    data = response.json()
-    assert data["rotation_weeks"] == 1  # Default value
@@ -6,11 +6,11 @@ from app.repositories.allowed_person_repository import AllowedPersonRepository
 
 
 @pytest.mark.asyncio
-async def test_register_with_allowed_dni(client: AsyncClient, test_db: AsyncSession):
+async def test_register_with_allowed_dni(client: AsyncClient, test_db: AsyncSession, seed_allowed):
     """Test that registration succeeds with an allowed DNI."""
     # First, add the DNI to the allowed list
     allowed_repo = AllowedPersonRepository(test_db)
-    await allowed_repo.bulk_create([{"dni": "12345678901", "full_name": "Test User"}])
+    await seed_allowed([{"dni": "12345678901", "full_name": "Test User"}])
     
     # Now try to register with this DNI
     response = await client.post(
@@ -73,7 +73,9 @@ async def test_register_non_patient_without_whitelist(client: AsyncClient, test_
 
 
 @pytest.mark.asyncio
-async def test_bulk_create_allowed_persons(client: AsyncClient, test_db: AsyncSession):
+async def test_bulk_create_allowed_persons(
+    client: AsyncClient, test_db: AsyncSession, seeded_users, auth_headers
+):
     """Test bulk creation of allowed persons."""
     response = await client.post(
         "/patients/allowed-persons/bulk",
@@ -84,6 +86,7 @@ async def test_bulk_create_allowed_persons(client: AsyncClient, test_db: AsyncSe
                 {"dni": "33333333333"},
             ]
         },
+        headers=auth_headers["admin"],
     )
     
     assert response.status_code == 201
@@ -103,12 +106,12 @@ async def test_bulk_create_allowed_persons(client: AsyncClient, test_db: AsyncSe
 
 
 @pytest.mark.asyncio
-async def test_is_dni_allowed(test_db: AsyncSession):
+async def test_is_dni_allowed(test_db: AsyncSession, seed_allowed):
     """Test the is_dni_allowed repository method."""
     allowed_repo = AllowedPersonRepository(test_db)
     
     # Add a DNI
-    await allowed_repo.bulk_create([{"dni": "12345678901"}])
+    await seed_allowed([{"dni": "12345678901"}])
     
     # Check it's allowed
     assert await allowed_repo.is_dni_allowed("12345678901") is True
@@ -118,12 +121,12 @@ async def test_is_dni_allowed(test_db: AsyncSession):
 
 
 @pytest.mark.asyncio
-async def test_mark_as_registered(test_db: AsyncSession):
+async def test_mark_as_registered(test_db: AsyncSession, seed_allowed):
     """Test marking a DNI as registered."""
     allowed_repo = AllowedPersonRepository(test_db)
     
     # Add a DNI
-    await allowed_repo.bulk_create([{"dni": "12345678901"}])
+    await seed_allowed([{"dni": "12345678901"}])
     
     # Verify it's not registered initially
     person = await allowed_repo.get_by_dni("12345678901")
@@ -135,3 +138,39 @@ async def test_mark_as_registered(test_db: AsyncSession):
     # Verify it's now registered
     person = await allowed_repo.get_by_dni("12345678901")
     assert person.is_registered is True
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_skips_existing_dnis(test_db: AsyncSession):
+    """Test that bulk creation ignores DNIs that are already whitelisted."""
+    allowed_repo = AllowedPersonRepository(test_db)
+    
+    await allowed_repo.bulk_create([{"dni": "12345678901", "full_name": "Original"}])
+    
+    created = await allowed_repo.bulk_create([
+        {"dni": "12345678901", "full_name": "Duplicate"},
+        {"dni": "98765432100"},
+    ])
+    
+    assert [person.dni for person in created] == ["98765432100"]
+    
+    # The existing entry is left untouched
+    person = await allowed_repo.get_by_dni("12345678901")
+    assert person.full_name == "Original"
+
+
+@pytest.mark.asyncio
+async def test_authorize_and_mark(test_db: AsyncSession, seed_allowed):
+    """Test authorizing a DNI and marking it as registered in one step."""
+    allowed_repo = AllowedPersonRepository(test_db)
+    
+    await seed_allowed([{"dni": "12345678901"}])
+    
+    assert await allowed_repo.authorize_and_mark("12345678901") is True
+    assert await allowed_repo.authorize_and_mark("99999999999") is False
+    
+    person = await allowed_repo.get_by_dni("12345678901")
+    assert person.is_registered is True
+    
+    # An already registered DNI is not authorized a second time
+    assert await allowed_repo.authorize_and_mark("12345678901") is False
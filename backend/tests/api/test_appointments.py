@@ -1,17 +1,29 @@
 import pytest
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, time
+from freezegun import freeze_time
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.user import User, UserRole
-from app.models.schedule import DoctorAvailability, DayOfWeek
+from app.models.category_schedule import CategorySchedule, CategoryType, RotationType
 from app.models.appointment import Appointment, AppointmentStatus
+from app.models.user import User
+from tests.factories import make_user
+
+
+@pytest.fixture
+def frozen_today():
+    """Pin the clock to Sunday 2024-01-07 so the searched weekdays are fixed dates."""
+    with freeze_time("2024-01-07"):
+        yield
 
 
 @pytest.mark.asyncio
-async def test_get_available_appointments_no_doctors(client: AsyncClient):
-    """Test getting available appointments when no doctors exist for specialty."""
-    response = await client.get("/appointments/available?specialty=Cardiology")
+async def test_get_slots_no_schedules(client: AsyncClient):
+    """Test getting slots when no schedule exists for the category."""
+    response = await client.get(
+        "/appointments/slots",
+        params={"category_name": "Cardiology", "category_type": "specialty"},
+    )
     
     assert response.status_code == 200
     data = response.json()
@@ -20,265 +32,212 @@ async def test_get_available_appointments_no_doctors(client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_get_available_appointments_with_availability(client: AsyncClient, test_db: AsyncSession):
-    """Test getting available appointments with doctor availability."""
-    # Create a doctor user
-    doctor = User(
-        dni="DOC123",
-        hashed_password="hashed",
-        full_name="Dr. John Smith",
-        role=UserRole.DOCTOR,
-        is_active=True,
-    )
-    test_db.add(doctor)
-    await test_db.commit()
-    await test_db.refresh(doctor)
-    
-    # Create availability for the doctor (Monday, 9 AM)
-    today = datetime.now()
-    # Calculate next Monday
-    days_ahead = 0 - today.weekday()  # 0 = Monday
-    if days_ahead <= 0:
-        days_ahead += 7
-    next_monday = today + timedelta(days=days_ahead)
-    
-    availability = DoctorAvailability(
-        doctor_id=doctor.id,
-        day_of_week=DayOfWeek.MONDAY,
+async def test_get_slots_with_schedule(
+    client: AsyncClient, test_db: AsyncSession, frozen_today
+):
+    """Test getting slots of a category with a weekly schedule."""
+    # Create a schedule for the category (Monday, 9 AM)
+    next_monday = date(2024, 1, 8)
+    
+    schedule = CategorySchedule(
+        category_type=CategoryType.SPECIALTY,
+        name="Cardiology",
+        day_of_week=0,  # Monday
         start_time=time(9, 0),
-        end_time=time(17, 0),
-        specialty="Cardiology",
+        turn_duration=30,
+        max_turns_per_block=4,
+        rotation_type=RotationType.FIXED,
     )
-    test_db.add(availability)
-    await test_db.commit()
+    test_db.add(schedule)
+    await test_db.flush()
     
-    # Get available appointments
-    response = await client.get("/appointments/available?specialty=Cardiology")
+    # Get available slots
+    response = await client.get(
+        "/appointments/slots",
+        params={"category_name": "Cardiology", "category_type": "specialty"},
+    )
     
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)
-    assert len(data) > 0
-    # Should return at most 3 slots
-    assert len(data) <= 3
+    # One slot per Monday, 3 slots returned
+    assert len(data) == 3
     
     # Verify the structure of the first slot
     first_slot = data[0]
-    assert "doctor_id" in first_slot
-    assert "doctor_name" in first_slot
-    assert "specialty" in first_slot
-    assert "appointment_date" in first_slot
-    assert "available" in first_slot
-    assert first_slot["doctor_id"] == doctor.id
-    assert first_slot["doctor_name"] == doctor.full_name
-    assert first_slot["specialty"] == "Cardiology"
+    assert "slot_datetime" in first_slot
+    assert "category_name" in first_slot
+    assert "category_id" in first_slot
+    assert "warning_message" in first_slot
+    assert "deadline_time" in first_slot
+    assert first_slot["category_id"] == schedule.id
+    assert first_slot["category_name"] == "Cardiology"
+    assert datetime.fromisoformat(first_slot["slot_datetime"]) == datetime.combine(next_monday, time(9, 0))
 
 
 @pytest.mark.asyncio
-async def test_get_available_appointments_excludes_booked_slots(
-    client: AsyncClient, test_db: AsyncSession
+async def test_get_slots_excludes_booked_slots(
+    client: AsyncClient, test_db: AsyncSession, frozen_today
 ):
-    """Test that booked slots are excluded from available appointments."""
-    # Create a doctor user
-    doctor = User(
-        dni="DOC456",
-        hashed_password="hashed",
-        full_name="Dr. Jane Doe",
-        role=UserRole.DOCTOR,
-        is_active=True,
-    )
-    test_db.add(doctor)
-    
+    """Test that booked slots are excluded from available slots."""
     # Create a patient user
-    patient = User(
-        dni="PAT123",
-        hashed_password="hashed",
-        full_name="John Patient",
-        role=UserRole.PATIENT,
-        is_active=True,
-    )
+    patient = make_user("PAT123", "John Patient")
     test_db.add(patient)
-    await test_db.commit()
-    await test_db.refresh(doctor)
-    await test_db.refresh(patient)
+    await test_db.flush()
     
-    # Create availability for the doctor (Tuesday, 10 AM)
-    today = datetime.now()
-    days_ahead = 1 - today.weekday()  # 1 = Tuesday
-    if days_ahead <= 0:
-        days_ahead += 7
-    next_tuesday = today + timedelta(days=days_ahead)
-    slot_time = datetime.combine(next_tuesday.date(), time(10, 0))
+    # Create a schedule for the category (Tuesday, 10 AM)
+    next_tuesday = date(2024, 1, 9)
+    slot_time = datetime.combine(next_tuesday, time(10, 0))
     
-    availability = DoctorAvailability(
-        doctor_id=doctor.id,
-        day_of_week=DayOfWeek.TUESDAY,
+    schedule = CategorySchedule(
+        category_type=CategoryType.SPECIALTY,
+        name="Dermatology",
+        day_of_week=1,  # Tuesday
         start_time=time(10, 0),
-        end_time=time(18, 0),
-        specialty="Dermatology",
+        turn_duration=30,
+        max_turns_per_block=4,
+        rotation_type=RotationType.FIXED,
     )
-    test_db.add(availability)
     
     # Book an appointment for this exact slot
     appointment = Appointment(
         patient_id=patient.id,
-        doctor_id=doctor.id,
         appointment_date=slot_time,
         status=AppointmentStatus.SCHEDULED,
         specialty="Dermatology",
     )
-    test_db.add(appointment)
-    await test_db.commit()
+    test_db.add_all([schedule, appointment])
+    await test_db.flush()
     
-    # Get available appointments
-    response = await client.get("/appointments/available?specialty=Dermatology")
+    # Get available slots
+    response = await client.get(
+        "/appointments/slots",
+        params={"category_name": "Dermatology", "category_type": "specialty"},
+    )
     
     assert response.status_code == 200
     data = response.json()
     
-    # The booked slot should not appear in available slots
-    for slot in data:
-        slot_datetime = datetime.fromisoformat(slot["appointment_date"].replace("Z", "+00:00"))
-        # The slot_time should not be in the available slots
-        assert slot_datetime != slot_time
+    # The booked slot should not appear; the next turn that day is offered instead
+    booked_iso = slot_time.isoformat()
+    assert not any(slot["slot_datetime"].startswith(booked_iso) for slot in data)
+    assert datetime.fromisoformat(data[0]["slot_datetime"]) == datetime.combine(next_tuesday, time(10, 30))
 
 
 @pytest.mark.asyncio
-async def test_book_appointment_success(client: AsyncClient, test_db: AsyncSession):
+async def test_book_appointment_success(
+    client: AsyncClient, seeded_users: dict[str, User], auth_headers
+):
     """Test successfully booking an appointment."""
-    # Create a doctor user
-    doctor = User(
-        dni="DOC789",
-        hashed_password="hashed",
-        full_name="Dr. Bob Wilson",
-        role=UserRole.DOCTOR,
-        is_active=True,
-    )
-    test_db.add(doctor)
-    await test_db.commit()
-    await test_db.refresh(doctor)
-    
-    # Create appointment datetime (future date)
-    appointment_date = datetime.now() + timedelta(days=7, hours=2)
-    
-    # Book the appointment
     response = await client.post(
         "/appointments/book",
         json={
-            "doctor_id": doctor.id,
-            "appointment_date": appointment_date.isoformat(),
-            "specialty": "General Medicine",
+            "category_id": 1,
+            "appointment_date": "2024-01-08T09:00:00",
+            "category_name": "General Medicine",
             "notes": "First visit",
         },
+        headers=auth_headers["patient"],
     )
     
     assert response.status_code == 201
     data = response.json()
-    assert data["doctor_id"] == doctor.id
+    assert data["patient_id"] == seeded_users["patient"].id
     assert data["specialty"] == "General Medicine"
     assert data["notes"] == "First visit"
     assert data["status"] == "scheduled"
     assert "id" in data
-    assert "patient_id" in data
 
 
 @pytest.mark.asyncio
-async def test_book_appointment_doctor_not_found(client: AsyncClient):
-    """Test booking appointment with non-existent doctor."""
-    appointment_date = datetime.now() + timedelta(days=7)
-    
+async def test_book_appointment_requires_authentication(client: AsyncClient):
+    """Test booking an appointment without a token."""
     response = await client.post(
         "/appointments/book",
         json={
-            "doctor_id": 99999,  # Non-existent doctor
-            "appointment_date": appointment_date.isoformat(),
-            "specialty": "Cardiology",
+            "category_id": 1,
+            "appointment_date": "2024-01-08T09:00:00",
+            "category_name": "Cardiology",
         },
     )
     
-    assert response.status_code == 404
-    assert "not found" in response.json()["detail"].lower()
+    assert response.status_code == 401
 
 
 @pytest.mark.asyncio
-async def test_book_appointment_slot_already_taken(client: AsyncClient, test_db: AsyncSession):
-    """Test booking an appointment when the slot is already taken."""
-    # Create a doctor user
-    doctor = User(
-        dni="DOC999",
-        hashed_password="hashed",
-        full_name="Dr. Alice Brown",
-        role=UserRole.DOCTOR,
-        is_active=True,
-    )
-    test_db.add(doctor)
+async def test_get_my_appointments(
+    client: AsyncClient, test_db: AsyncSession, seeded_users: dict[str, User], auth_headers
+):
+    """Test that patients only see their own appointments, newest first."""
+    patient = seeded_users["patient"]
+    other_patient = make_user("PAT999", "Jane Patient")
+    test_db.add(other_patient)
+    await test_db.flush()
     
-    # Create a patient user
-    patient = User(
-        dni="PAT999",
-        hashed_password="hashed",
-        full_name="Jane Patient",
-        role=UserRole.PATIENT,
-        is_active=True,
-    )
-    test_db.add(patient)
-    await test_db.commit()
-    await test_db.refresh(doctor)
-    await test_db.refresh(patient)
+    test_db.add_all([
+        Appointment(patient_id=patient.id, appointment_date=datetime(2024, 1, 8, 9, 0), specialty="Cardiology"),
+        Appointment(patient_id=patient.id, appointment_date=datetime(2024, 1, 15, 9, 0), specialty="Cardiology"),
+        Appointment(patient_id=other_patient.id, appointment_date=datetime(2024, 1, 8, 9, 30), specialty="Cardiology"),
+    ])
+    await test_db.flush()
     
-    # Create an appointment datetime
-    appointment_date = datetime.now() + timedelta(days=10)
+    response = await client.get("/appointments/me", headers=auth_headers["patient"])
     
-    # Create an existing appointment
-    existing_appointment = Appointment(
-        patient_id=patient.id,
-        doctor_id=doctor.id,
-        appointment_date=appointment_date,
-        status=AppointmentStatus.SCHEDULED,
-        specialty="Orthopedics",
+    assert response.status_code == 200
+    data = response.json()
+    assert [datetime.fromisoformat(a["appointment_date"]) for a in data] == [
+        datetime(2024, 1, 15, 9, 0),
+        datetime(2024, 1, 8, 9, 0),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cancel_own_appointment(
+    client: AsyncClient, test_db: AsyncSession, seeded_users: dict[str, User], auth_headers
+):
+    """Test that a patient can cancel their own appointment."""
+    appointment = Appointment(
+        patient_id=seeded_users["patient"].id,
+        appointment_date=datetime(2024, 1, 8, 9, 0),
+        specialty="Cardiology",
     )
-    test_db.add(existing_appointment)
-    await test_db.commit()
+    test_db.add(appointment)
+    await test_db.flush()
     
-    # Try to book the same slot
-    response = await client.post(
-        "/appointments/book",
-        json={
-            "doctor_id": doctor.id,
-            "appointment_date": appointment_date.isoformat(),
-            "specialty": "Orthopedics",
-        },
-    )
+    response = await client.put(f"/appointments/{appointment.id}/cancel", headers=auth_headers["patient"])
     
-    assert response.status_code == 409
-    assert "no longer available" in response.json()["detail"].lower()
+    assert response.status_code == 200
+    assert response.json()["status"] == "cancelled"
 
 
 @pytest.mark.asyncio
-async def test_book_appointment_inactive_doctor(client: AsyncClient, test_db: AsyncSession):
-    """Test booking appointment with inactive doctor."""
-    # Create an inactive doctor user
-    doctor = User(
-        dni="DOC111",
-        hashed_password="hashed",
-        full_name="Dr. Inactive",
-        role=UserRole.DOCTOR,
-        is_active=False,  # Inactive
+async def test_cancel_other_patients_appointment(
+    client: AsyncClient, test_db: AsyncSession, seeded_users: dict[str, User], auth_headers
+):
+    """Test that a patient cannot cancel another patient's appointment."""
+    other_patient = make_user("PAT999", "Jane Patient")
+    test_db.add(other_patient)
+    await test_db.flush()
+    
+    appointment = Appointment(
+        patient_id=other_patient.id,
+        appointment_date=datetime(2024, 1, 8, 9, 0),
+        specialty="Cardiology",
     )
-    test_db.add(doctor)
-    await test_db.commit()
-    await test_db.refresh(doctor)
+    test_db.add(appointment)
+    await test_db.flush()
     
-    appointment_date = datetime.now() + timedelta(days=7)
+    response = await client.put(f"/appointments/{appointment.id}/cancel", headers=auth_headers["patient"])
     
-    response = await client.post(
-        "/appointments/book",
-        json={
-            "doctor_id": doctor.id,
-            "appointment_date": appointment_date.isoformat(),
-            "specialty": "Neurology",
-        },
-    )
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_cancel_appointment_not_found(
+    client: AsyncClient, seeded_users: dict[str, User], auth_headers
+):
+    """Test cancelling an appointment that does not exist."""
+    response = await client.put("/appointments/99999/cancel", headers=auth_headers["patient"])
     
     assert response.status_code == 404
     assert "not found" in response.json()["detail"].lower()
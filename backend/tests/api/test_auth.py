@@ -1,18 +1,15 @@
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
-from unittest.mock import patch
 
 from app.models.user import UserRole
-from app.repositories.allowed_person_repository import AllowedPersonRepository
 
 
 @pytest.mark.asyncio
-async def test_register_user(client: AsyncClient, test_db: AsyncSession):
+async def test_register_user(client: AsyncClient, test_db: AsyncSession, seed_allowed):
     """Test successful user registration."""
     # Add DNI to whitelist
-    allowed_repo = AllowedPersonRepository(test_db)
-    await allowed_repo.bulk_create([{"dni": "12345678901"}])
+    await seed_allowed([{"dni": "12345678901"}])
     
     response = await client.post(
         "/auth/users/register",
@@ -35,11 +32,10 @@ async def test_register_user(client: AsyncClient, test_db: AsyncSession):
 
 
 @pytest.mark.asyncio
-async def test_register_duplicate_dni(client: AsyncClient, test_db: AsyncSession):
+async def test_register_duplicate_dni(client: AsyncClient, test_db: AsyncSession, seed_allowed):
     """Test registration with duplicate DNI returns 409."""
     # Add DNI to whitelist
-    allowed_repo = AllowedPersonRepository(test_db)
-    await allowed_repo.bulk_create([{"dni": "12345678901"}])
+    await seed_allowed([{"dni": "12345678901"}])
     
     # Register first user
     await client.post(
@@ -70,11 +66,10 @@ async def test_register_duplicate_dni(client: AsyncClient, test_db: AsyncSession
 
 
 @pytest.mark.asyncio
-async def test_login_success(client: AsyncClient, test_db: AsyncSession):
+async def test_login_success(client: AsyncClient, test_db: AsyncSession, seed_allowed):
     """Test successful login."""
     # Add DNI to whitelist
-    allowed_repo = AllowedPersonRepository(test_db)
-    await allowed_repo.bulk_create([{"dni": "12345678901"}])
+    await seed_allowed([{"dni": "12345678901"}])
     
     # Register a user first
     await client.post(
@@ -105,11 +100,10 @@ async def test_login_success(client: AsyncClient, test_db: AsyncSession):
 
 
 @pytest.mark.asyncio
-async def test_login_wrong_password(client: AsyncClient, test_db: AsyncSession):
+async def test_login_wrong_password(client: AsyncClient, test_db: AsyncSession, seed_allowed):
     """Test login with wrong password returns 401."""
     # Add DNI to whitelist
-    allowed_repo = AllowedPersonRepository(test_db)
-    await allowed_repo.bulk_create([{"dni": "12345678901"}])
+    await seed_allowed([{"dni": "12345678901"}])
     
     # Register a user first
     await client.post(
@@ -151,34 +145,32 @@ async def test_login_nonexistent_user(client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_staff_login_success(client: AsyncClient):
+async def test_staff_login_success(client: AsyncClient, staff_password: str):
     """Test successful staff login."""
-    with patch("app.api.endpoints.auth.settings.STAFF_PASSWORD", "correct-staff-password"):
-        response = await client.post(
-            "/auth/login/staff",
-            json={
-                "password": "correct-staff-password",
-            },
-        )
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert "access_token" in data
-        assert data["token_type"] == "bearer"
-        assert isinstance(data["access_token"], str)
-        assert len(data["access_token"]) > 0
+    response = await client.post(
+        "/auth/login/staff",
+        json={
+            "password": staff_password,
+        },
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert "access_token" in data
+    assert data["token_type"] == "bearer"
+    assert isinstance(data["access_token"], str)
+    assert len(data["access_token"]) > 0
 
 
 @pytest.mark.asyncio
-async def test_staff_login_wrong_password(client: AsyncClient):
+async def test_staff_login_wrong_password(client: AsyncClient, staff_password: str):
     """Test staff login with wrong password returns 401."""
-    with patch("app.api.endpoints.auth.settings.STAFF_PASSWORD", "correct-staff-password"):
-        response = await client.post(
-            "/auth/login/staff",
-            json={
-                "password": "wrong-password",
-            },
-        )
-        
-        assert response.status_code == 401
-        assert "incorrect" in response.json()["detail"].lower()
+    response = await client.post(
+        "/auth/login/staff",
+        json={
+            "password": "wrong-password",
+        },
+    )
+    
+    assert response.status_code == 401
+    assert "incorrect" in response.json()["detail"].lower()
@@ -1,11 +1,25 @@
 """Tests for authentication and authorization middleware."""
 import pytest
+import pytest_asyncio
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import create_access_token
-from app.models.user import UserRole
-from app.repositories.allowed_person_repository import AllowedPersonRepository
+from tests.factories import make_user
+
+
+@pytest_asyncio.fixture
+async def patient_with_history(client: AsyncClient, patient_id: int, auth_headers) -> int:
+    """The seeded patient after staff filled in their medical history; returns the patient id."""
+    response = await client.patch(
+        f"/patients/{patient_id}/medical-history",
+        json={
+            "medical_history": {"condition": "healthy"},
+            "allergies": "None",
+        },
+        headers=auth_headers["staff"],
+    )
+    assert response.status_code == 200
+    return patient_id
 
 
 @pytest.mark.asyncio
@@ -26,71 +40,64 @@ async def test_invalid_token_returns_401(client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_patient_cannot_access_admin_endpoints(client: AsyncClient, test_db: AsyncSession):
-    """Test that patients cannot access admin-only endpoints."""
-    # Create a patient user
-    allowed_repo = AllowedPersonRepository(test_db)
-    await allowed_repo.bulk_create([{"dni": "11111111111"}])
-    
-    patient_response = await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "11111111111",
-            "password": "testpass123",
-            "full_name": "Patient User",
-            "role": "patient",
-        },
+@pytest.mark.parametrize(
+    "method, url, payload",
+    [
+        # Patient list (admin/staff/doctor only)
+        pytest.param("GET", "/patients/", None, id="list_patients"),
+        # Only medical professionals can add entries, even to the patient's own record
+        pytest.param(
+            "POST",
+            "/patients/{patient_id}/medical-record/entries",
+            {
+                "entry_type": "consultation",
+                "specialty": "General",
+                "doctor_name": "Dr. Test",
+                "diagnosis": "Healthy",
+            },
+            id="add_medical_record_entry",
+        ),
+        # Whitelist management (admin/staff only)
+        pytest.param(
+            "POST",
+            "/patients/allowed-persons/bulk",
+            {"persons": [{"dni": "33333333333", "full_name": "Person 3"}]},
+            id="allowed_persons_bulk",
+        ),
+    ],
+)
+async def test_patient_cannot_access_restricted_endpoints(
+    client: AsyncClient,
+    patient_id: int,
+    auth_headers,
+    method: str,
+    url: str,
+    payload,
+):
+    """Test that patients get 403 from endpoints reserved for other roles."""
+    response = await client.request(
+        method,
+        url.format(patient_id=patient_id),
+        json=payload,
+        headers=auth_headers["patient"],
     )
-    assert patient_response.status_code == 201
-    
-    # Create token for patient
-    token = create_access_token({"sub": "11111111111", "role": "patient"})
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # Try to access patient list (admin/staff/doctor only)
-    response = await client.get("/patients/", headers=headers)
     assert response.status_code == 403
     assert "Insufficient permissions" in response.json()["detail"]
 
 
 @pytest.mark.asyncio
-async def test_patient_cannot_access_other_patient_data(client: AsyncClient, test_db: AsyncSession):
+async def test_patient_cannot_access_other_patient_data(
+    client: AsyncClient, test_db: AsyncSession, patient_id: int, auth_headers
+):
     """Test that patients cannot access other patients' medical records."""
-    # Create two patients
-    allowed_repo = AllowedPersonRepository(test_db)
-    await allowed_repo.bulk_create([
-        {"dni": "11111111111"},
-        {"dni": "22222222222"},
-    ])
-    
-    patient1_response = await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "11111111111",
-            "password": "testpass123",
-            "full_name": "Patient 1",
-            "role": "patient",
-        },
-    )
-    patient1_id = patient1_response.json()["id"]
-    
-    patient2_response = await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "22222222222",
-            "password": "testpass123",
-            "full_name": "Patient 2",
-            "role": "patient",
-        },
-    )
-    patient2_id = patient2_response.json()["id"]
-    
-    # Create token for patient 1
-    token = create_access_token({"sub": "11111111111", "role": "patient"})
-    headers = {"Authorization": f"Bearer {token}"}
+    # Create a second patient
+    patient2 = make_user("22222222222", "Patient 2")
+    test_db.add(patient2)
+    await test_db.flush()
+    patient2_id = patient2.id
     
     # Patient 1 tries to access Patient 2's medical history
-    response = await client.get(f"/patients/{patient2_id}/medical-history", headers=headers)
+    response = await client.get(f"/patients/{patient2_id}/medical-history", headers=auth_headers["patient"])
     assert response.status_code == 403
     # Verify error message indicates permission denied
     error_detail = response.json()["detail"]
@@ -98,226 +105,53 @@ async def test_patient_cannot_access_other_patient_data(client: AsyncClient, tes
 
 
 @pytest.mark.asyncio
-async def test_patient_can_access_own_medical_record(client: AsyncClient, test_db: AsyncSession):
+async def test_patient_can_access_own_medical_record(
+    client: AsyncClient, patient_with_history: int, auth_headers
+):
     """Test that patients can access their own medical record."""
-    # Create a patient
-    allowed_repo = AllowedPersonRepository(test_db)
-    await allowed_repo.bulk_create([{"dni": "11111111111"}])
-    
-    patient_response = await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "11111111111",
-            "password": "testpass123",
-            "full_name": "Patient User",
-            "role": "patient",
-        },
+    response = await client.get(
+        f"/patients/{patient_with_history}/medical-history", headers=auth_headers["patient"]
     )
-    patient_id = patient_response.json()["id"]
-    
-    # Create token for patient
-    token = create_access_token({"sub": "11111111111", "role": "patient"})
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # Create medical history for the patient
-    await client.patch(
-        f"/patients/{patient_id}/medical-history",
-        json={
-            "medical_history": {"condition": "healthy"},
-            "allergies": "None",
-        },
-        headers=headers,
-    )
-    
-    # Patient accesses their own medical history
-    response = await client.get(f"/patients/{patient_id}/medical-history", headers=headers)
     assert response.status_code == 200
     data = response.json()
-    assert data["patient_id"] == patient_id
+    assert data["patient_id"] == patient_with_history
 
 
 @pytest.mark.asyncio
-async def test_staff_can_access_all_patients(client: AsyncClient, test_db: AsyncSession):
+async def test_staff_can_access_all_patients(client: AsyncClient, patient_with_history: int, auth_headers):
     """Test that staff can access all patient records."""
-    # Create a patient
-    allowed_repo = AllowedPersonRepository(test_db)
-    await allowed_repo.bulk_create([{"dni": "11111111111", "full_name": "Patient User"}])
-    
-    patient_response = await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "11111111111",
-            "password": "testpass123",
-            "full_name": "Patient User",
-            "role": "patient",
-        },
-    )
-    patient_id = patient_response.json()["id"]
-    
-    # Create a staff user
-    staff_response = await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "99999999999",
-            "password": "staffpass123",
-            "full_name": "Staff User",
-            "role": "staff",
-        },
-    )
-    
-    # Create token for staff
-    token = create_access_token({"sub": "99999999999", "role": "staff"})
-    headers = {"Authorization": f"Bearer {token}"}
+    headers = auth_headers["staff"]
     
     # Staff can access patient list
     response = await client.get("/patients/", headers=headers)
     assert response.status_code == 200
     
-    # Create medical history for the patient (using staff token)
-    await client.patch(
-        f"/patients/{patient_id}/medical-history",
-        json={
-            "medical_history": {"condition": "test"},
-            "allergies": "None",
-        },
-        headers=headers,
-    )
-    
     # Staff can access any patient's medical history
-    response = await client.get(f"/patients/{patient_id}/medical-history", headers=headers)
+    response = await client.get(f"/patients/{patient_with_history}/medical-history", headers=headers)
     assert response.status_code == 200
 
 
 @pytest.mark.asyncio
-async def test_doctor_can_access_all_patients(client: AsyncClient, test_db: AsyncSession):
+async def test_doctor_can_access_all_patients(client: AsyncClient, seeded_users, auth_headers):
     """Test that doctors can access all patient records."""
-    # Create a patient
-    allowed_repo = AllowedPersonRepository(test_db)
-    await allowed_repo.bulk_create([{"dni": "11111111111"}])
-    
-    patient_response = await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "11111111111",
-            "password": "testpass123",
-            "full_name": "Patient User",
-            "role": "patient",
-        },
-    )
-    patient_id = patient_response.json()["id"]
-    
-    # Create a doctor user
-    await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "88888888888",
-            "password": "doctorpass123",
-            "full_name": "Doctor User",
-            "role": "doctor",
-        },
-    )
-    
-    # Create token for doctor
-    token = create_access_token({"sub": "88888888888", "role": "doctor"})
-    headers = {"Authorization": f"Bearer {token}"}
-    
     # Doctor can access patient list
-    response = await client.get("/patients/", headers=headers)
+    response = await client.get("/patients/", headers=auth_headers["doctor"])
     assert response.status_code == 200
 
 
 @pytest.mark.asyncio
-async def test_patient_cannot_add_medical_record_entries(client: AsyncClient, test_db: AsyncSession):
-    """Test that patients cannot add medical record entries."""
-    # Create a patient
-    allowed_repo = AllowedPersonRepository(test_db)
-    await allowed_repo.bulk_create([{"dni": "11111111111"}])
-    
-    patient_response = await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "11111111111",
-            "password": "testpass123",
-            "full_name": "Patient User",
-            "role": "patient",
-        },
-    )
-    patient_id = patient_response.json()["id"]
-    
-    # Create token for patient
-    token = create_access_token({"sub": "11111111111", "role": "patient"})
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # Patient tries to add medical record entry
-    response = await client.post(
-        f"/patients/{patient_id}/medical-record/entries",
-        json={
-            "entry_type": "consultation",
-            "specialty": "General",
-            "doctor_name": "Dr. Test",
-            "diagnosis": "Healthy",
-        },
-        headers=headers,
-    )
-    assert response.status_code == 403
-
-
-@pytest.mark.asyncio
-async def test_patient_can_download_own_pdf(client: AsyncClient, test_db: AsyncSession):
+async def test_patient_can_download_own_pdf(client: AsyncClient, patient_with_history: int, auth_headers):
     """Test that patients can download their own medical record PDF."""
-    # Create a patient and medical record
-    allowed_repo = AllowedPersonRepository(test_db)
-    await allowed_repo.bulk_create([{"dni": "11111111111"}])
-    
-    patient_response = await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "11111111111",
-            "password": "testpass123",
-            "full_name": "Patient User",
-            "role": "patient",
-        },
-    )
-    patient_id = patient_response.json()["id"]
-    
-    # Create token for patient
-    token = create_access_token({"sub": "11111111111", "role": "patient"})
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # Create medical history first
-    await client.patch(
-        f"/patients/{patient_id}/medical-history",
-        json={
-            "medical_history": {"condition": "test"},
-            "allergies": "None",
-        },
-        headers=headers,
+    response = await client.get(
+        f"/patients/{patient_with_history}/medical-record/pdf", headers=auth_headers["patient"]
     )
-    
-    # Patient can download their own PDF
-    response = await client.get(f"/patients/{patient_id}/medical-record/pdf", headers=headers)
     assert response.status_code == 200
     assert response.headers["content-type"] == "application/pdf"
 
 
 @pytest.mark.asyncio
-async def test_admin_can_access_allowed_persons_bulk(client: AsyncClient, test_db: AsyncSession):
+async def test_admin_can_access_allowed_persons_bulk(client: AsyncClient, seeded_users, auth_headers):
     """Test that admins can access the allowed persons bulk endpoint."""
-    # Create an admin user
-    await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "77777777777",
-            "password": "adminpass123",
-            "full_name": "Admin User",
-            "role": "admin",
-        },
-    )
-    
-    # Create token for admin
-    token = create_access_token({"sub": "77777777777", "role": "admin"})
-    headers = {"Authorization": f"Bearer {token}"}
-    
     # Admin can access bulk create endpoint
     response = await client.post(
         "/patients/allowed-persons/bulk",
@@ -327,40 +161,6 @@ async def test_admin_can_access_allowed_persons_bulk(client: AsyncClient, test_d
                 {"dni": "22222222222", "full_name": "Person 2"},
             ]
         },
-        headers=headers,
+        headers=auth_headers["admin"],
     )
     assert response.status_code == 201
-
-
-@pytest.mark.asyncio
-async def test_patient_cannot_access_allowed_persons_bulk(client: AsyncClient, test_db: AsyncSession):
-    """Test that patients cannot access the allowed persons bulk endpoint."""
-    # Create a patient
-    allowed_repo = AllowedPersonRepository(test_db)
-    await allowed_repo.bulk_create([{"dni": "11111111111"}])
-    
-    await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "11111111111",
-            "password": "testpass123",
-            "full_name": "Patient User",
-            "role": "patient",
-        },
-    )
-    
-    # Create token for patient
-    token = create_access_token({"sub": "11111111111", "role": "patient"})
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # Patient tries to access bulk create endpoint
-    response = await client.post(
-        "/patients/allowed-persons/bulk",
-        json={
-            "persons": [
-                {"dni": "33333333333", "full_name": "Person 3"},
-            ]
-        },
-        headers=headers,
-    )
-    assert response.status_code == 403
@@ -1,5 +1,6 @@
 import pytest
 from datetime import datetime, time, date
+from freezegun import freeze_time
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -8,7 +9,7 @@ from app.api.endpoints.auth import create_access_token
 
 @pytest.mark.asyncio
 async def test_get_slots_multi_day_search(client: AsyncClient, test_db: AsyncSession):
-    """Test getting slots across multiple days (next 14 days)."""
+    """Test that the next 3 slots are searched across days, one per day."""
     # 1. Create a schedule for Monday
     monday_cat = CategorySchedule(
         category_type=CategoryType.SPECIALTY,
@@ -29,28 +30,26 @@ async def test_get_slots_multi_day_search(client: AsyncClient, test_db: AsyncSes
         max_turns_per_block=2,
         rotation_type=RotationType.FIXED,
     )
-    test_db.add(monday_cat)
-    test_db.add(wednesday_cat)
-    await test_db.commit()
+    test_db.add_all([monday_cat, wednesday_cat])
+    await test_db.flush()
     
-    # 3. Query slots starting from a Sunday (2024-01-07)
-    # Should find Monday (Jan 8) and Wednesday (Jan 10)
-    test_date = "2024-01-07"
-    response = await client.get(
-        "/appointments/slots",
-        params={
-            "category_name": "Pediatria",
-            "category_type": "specialty",
-            "date": test_date
-        }
-    )
+    # 3. Query slots on a Sunday (2024-01-07); the search always starts today
+    # Should find Monday (Jan 8), Wednesday (Jan 10) and the next Monday (Jan 15)
+    with freeze_time("2024-01-07"):
+        response = await client.get(
+            "/appointments/slots",
+            params={
+                "category_name": "Pediatria",
+                "category_type": "specialty",
+            }
+        )
     
     assert response.status_code == 200
     data = response.json()
     
-    # Each day has 2 slots, and there are 2 Mondays and 2 Wednesdays in 14 days
-    assert len(data) == 8
-    # Check that we have slots from both days
-    dates = [d["slot_datetime"] for d in data]
-    assert any("2024-01-08T09:00:00" in d for d in dates)
-    assert any("2024-01-10T14:00:00" in d for d in dates)
+    # Only the first free turn of each day is offered, 3 at most
+    assert [d["slot_datetime"] for d in data] == [
+        "2024-01-08T09:00:00",
+        "2024-01-10T14:00:00",
+        "2024-01-15T09:00:00",
+    ]
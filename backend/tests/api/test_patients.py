@@ -1,199 +1,63 @@
 import pytest
+from datetime import datetime
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import create_access_token
-from app.repositories.allowed_person_repository import AllowedPersonRepository
+from app.models.patient import TriageData
+from app.models.user import UserRole
+from tests.factories import AUTH_DNIS, make_user
 
 
 @pytest.mark.asyncio
-async def test_list_all_patients_empty(client: AsyncClient, test_db: AsyncSession):
-    """Test listing patients when database is empty."""
+async def test_list_patients_filters_and_fields(client: AsyncClient, test_db: AsyncSession, auth_headers):
+    """Test that listing patients returns only patient users, with their triage data if any."""
     # Create staff user for authentication
-    await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "99999999999",
-            "password": "staffpass123",
-            "full_name": "Staff User",
-            "role": "staff",
-        },
-    )
-    
-    # Create token for staff
-    token = create_access_token({"sub": "99999999999", "role": "staff"})
-    headers = {"Authorization": f"Bearer {token}"}
+    test_db.add(make_user(AUTH_DNIS["staff"], "Staff User", UserRole.STAFF))
+    await test_db.flush()
+    headers = auth_headers["staff"]
     
+    # No patients yet
     response = await client.get("/patients/", headers=headers)
-    
     assert response.status_code == 200
-    data = response.json()
-    assert isinstance(data, list)
-    assert len(data) == 0
-
-
-@pytest.mark.asyncio
-async def test_list_all_patients_with_data(client: AsyncClient, test_db: AsyncSession):
-    """Test listing patients with patient data."""
-    # Create staff user for authentication
-    await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "99999999999",
-            "password": "staffpass123",
-            "full_name": "Staff User",
-            "role": "staff",
-        },
-    )
-    
-    # Add patient DNI to allowed persons list
-    allowed_repo = AllowedPersonRepository(test_db)
-    await allowed_repo.bulk_create([{"dni": "98765432101"}])
-    
-    # Create a patient user
-    patient_response = await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "98765432101",
-            "password": "testpassword123",
-            "full_name": "Test Patient",
-            "role": "patient",
-        },
-    )
-    assert patient_response.status_code == 201
-    patient = patient_response.json()
-    patient_id = patient["id"]
-    
-    # Create token for staff to add medical history
-    staff_token = create_access_token({"sub": "99999999999", "role": "staff"})
-    staff_headers = {"Authorization": f"Bearer {staff_token}"}
-    
-    # Add medical history for the patient
-    await client.patch(
-        f"/patients/{patient_id}/medical-history",
-        json={
-            "medical_history": {
+    assert response.json() == []
+    
+    # A patient with medical history, one without, and a doctor (non-patient role)
+    patient = make_user("98765432101", "Test Patient")
+    new_patient = make_user("33333333333", "New Patient")
+    doctor = make_user("22222222222", "Doctor User", UserRole.DOCTOR)
+    test_db.add_all([patient, new_patient, doctor])
+    await test_db.flush()
+    test_db.add(
+        TriageData(
+            patient_id=patient.id,
+            medical_history={
                 "chronic_diseases": "Diabetes",
                 "current_medications": "Metformin"
             },
-            "allergies": "Penicillin"
-        },
-        headers=staff_headers,
+            allergies="Penicillin",
+            last_updated=datetime(2024, 1, 8, 9, 0),
+        )
     )
+    await test_db.flush()
     
     # List all patients
-    response = await client.get("/patients/", headers=staff_headers)
+    response = await client.get("/patients/", headers=headers)
     
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)
-    assert len(data) >= 1
     
-    # Find our test patient
-    test_patient = next((p for p in data if p["dni"] == "98765432101"), None)
-    assert test_patient is not None
+    # Check that only patient role users are returned
+    patients_by_dni = {p["dni"]: p for p in data}
+    assert set(patients_by_dni) == {"98765432101", "33333333333"}
+    
+    test_patient = patients_by_dni["98765432101"]
     assert test_patient["full_name"] == "Test Patient"
     assert test_patient["allergies"] == "Penicillin"
     assert test_patient["medical_history"]["chronic_diseases"] == "Diabetes"
-
-
-@pytest.mark.asyncio
-async def test_list_patients_excludes_non_patients(client: AsyncClient, test_db: AsyncSession):
-    """Test that listing patients only returns users with patient role."""
-    # Create staff user for authentication
-    await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "99999999999",
-            "password": "staffpass123",
-            "full_name": "Staff User",
-            "role": "staff",
-        },
-    )
-    
-    # Create a patient
-    allowed_repo = AllowedPersonRepository(test_db)
-    await allowed_repo.bulk_create([{"dni": "11111111111"}])
-    
-    await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "11111111111",
-            "password": "testpassword123",
-            "full_name": "Patient User",
-            "role": "patient",
-        },
-    )
-    
-    # Create a doctor (non-patient role)
-    await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "22222222222",
-            "password": "testpassword123",
-            "full_name": "Doctor User",
-            "role": "doctor",
-        },
-    )
-    
-    # Create token for staff
-    token = create_access_token({"sub": "99999999999", "role": "staff"})
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # List all patients
-    response = await client.get("/patients/", headers=headers)
-    
-    assert response.status_code == 200
-    data = response.json()
-    
-    # Check that only patient role users are returned
-    patient_dnis = [p["dni"] for p in data]
-    assert "11111111111" in patient_dnis
-    assert "22222222222" not in patient_dnis
-
-
-@pytest.mark.asyncio
-async def test_list_patients_without_medical_history(client: AsyncClient, test_db: AsyncSession):
-    """Test listing patients who haven't filled medical history yet."""
-    # Create staff user for authentication
-    await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "99999999999",
-            "password": "staffpass123",
-            "full_name": "Staff User",
-            "role": "staff",
-        },
-    )
-    
-    # Create a patient without medical history
-    allowed_repo = AllowedPersonRepository(test_db)
-    await allowed_repo.bulk_create([{"dni": "33333333333"}])
-    
-    patient_response = await client.post(
-        "/auth/users/register",
-        json={
-            "dni": "33333333333",
-            "password": "testpassword123",
-            "full_name": "New Patient",
-            "role": "patient",
-        },
-    )
-    assert patient_response.status_code == 201
-    
-    # Create token for staff
-    token = create_access_token({"sub": "99999999999", "role": "staff"})
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # List all patients
-    response = await client.get("/patients/", headers=headers)
-    
-    assert response.status_code == 200
-    data = response.json()
     
-    # Find our test patient
-    test_patient = next((p for p in data if p["dni"] == "33333333333"), None)
-    assert test_patient is not None
-    assert test_patient["full_name"] == "New Patient"
-    assert test_patient["medical_history"] is None
-    assert test_patient["allergies"] is None
+    # Patients who haven't filled medical history yet are listed without it
+    new_patient_data = patients_by_dni["33333333333"]
+    assert new_patient_data["full_name"] == "New Patient"
+    assert new_patient_data["medical_history"] is None
+    assert new_patient_data["allergies"] is None
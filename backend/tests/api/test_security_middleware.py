@@ -1,8 +1,10 @@
 """Tests for security middleware (HTTPS redirect and Trusted Host)."""
 import os
 import pytest
+from fastapi.middleware.cors import CORSMiddleware
 from httpx import AsyncClient
-from unittest.mock import patch
+from starlette.middleware.httpsredirect import HTTPSRedirectMiddleware
+from starlette.middleware.trustedhost import TrustedHostMiddleware
 
 
 @pytest.mark.asyncio
@@ -22,68 +24,37 @@ async def test_root_endpoint_accessible_in_development(client: AsyncClient):
     assert "message" in response.json()
 
 
-@pytest.mark.asyncio
-async def test_trusted_host_middleware_allows_localhost():
+def test_trusted_host_middleware_allows_localhost(allowed_hosts: list[str]):
     """Test that TrustedHostMiddleware allows localhost by default."""
     # This test verifies the middleware configuration
     # In development mode, all hosts should be allowed (including *)
-    from app.main import ALLOWED_HOSTS
-    
-    # In development, wildcard should be present
     if os.getenv("ENVIRONMENT", "development") != "production":
-        assert "*" in ALLOWED_HOSTS or "localhost" in ALLOWED_HOSTS
+        assert "*" in allowed_hosts or "localhost" in allowed_hosts
 
 
-@pytest.mark.asyncio  
-async def test_https_redirect_disabled_in_development():
+def test_https_redirect_disabled_in_development(middleware_classes: list[type]):
     """Test that HTTPS redirect is disabled in development."""
-    # Import app to check middleware configuration
-    from app.main import app
-    from starlette.middleware.httpsredirect import HTTPSRedirectMiddleware
-    
-    # Check that HTTPSRedirectMiddleware is not in the middleware stack
-    # when ENVIRONMENT is not set to 'production'
-    middleware_classes = [m.cls for m in app.user_middleware]
-    
     # In development (default), HTTPSRedirectMiddleware should not be present
     if os.getenv("ENVIRONMENT", "development") != "production":
         assert HTTPSRedirectMiddleware not in middleware_classes
-    
 
-@pytest.mark.asyncio
-async def test_trusted_host_middleware_is_configured():
+
+def test_trusted_host_middleware_is_configured(middleware_classes: list[type]):
     """Test that TrustedHostMiddleware is configured."""
-    from app.main import app
-    from starlette.middleware.trustedhost import TrustedHostMiddleware
-    
-    # Check that TrustedHostMiddleware is in the middleware stack
-    middleware_classes = [m.cls for m in app.user_middleware]
     assert TrustedHostMiddleware in middleware_classes
 
 
-@pytest.mark.asyncio
-async def test_cors_middleware_is_configured():
+def test_cors_middleware_is_configured(middleware_classes: list[type]):
     """Test that CORSMiddleware is configured."""
-    from app.main import app
-    from fastapi.middleware.cors import CORSMiddleware
-    
-    # Check that CORSMiddleware is in the middleware stack
-    middleware_classes = [m.cls for m in app.user_middleware]
     assert CORSMiddleware in middleware_classes
 
 
-@pytest.mark.asyncio
-async def test_middleware_ordering():
+def test_middleware_ordering(middleware_classes: list[type]):
     """Test that middlewares are in the correct order."""
-    from app.main import app
-    from fastapi.middleware.cors import CORSMiddleware
-    from starlette.middleware.trustedhost import TrustedHostMiddleware
-    
-    middleware_classes = [m.cls for m in app.user_middleware]
-    
     # Find positions of each middleware
-    cors_idx = middleware_classes.index(CORSMiddleware) if CORSMiddleware in middleware_classes else -1
-    trusted_host_idx = middleware_classes.index(TrustedHostMiddleware) if TrustedHostMiddleware in middleware_classes else -1
+    positions = {cls: i for i, cls in enumerate(middleware_classes)}
+    cors_idx = positions.get(CORSMiddleware, -1)
+    trusted_host_idx = positions.get(TrustedHostMiddleware, -1)
     
     # Both should be present
     assert cors_idx >= 0, "CORSMiddleware should be configured"
@@ -94,8 +65,7 @@ async def test_middleware_ordering():
     assert trusted_host_idx > cors_idx, "TrustedHostMiddleware should wrap CORSMiddleware"
 
 
-@pytest.mark.asyncio
-async def test_production_https_redirect_configuration():
+def test_production_https_redirect_configuration():
     """Test that HTTPS redirect is enabled in production mode."""
     # Note: This test verifies the logic - actual production testing should be done in deployment
     # We check that the middleware would be added based on the environment variable
@@ -108,17 +78,14 @@ async def test_production_https_redirect_configuration():
     # This is verified by the conditional in main.py: if os.getenv("ENVIRONMENT", "development") == "production"
 
 
-@pytest.mark.asyncio
-async def test_production_trusted_host_configuration_requires_env_var():
+def test_production_trusted_host_configuration_requires_env_var(allowed_hosts: list[str]):
     """Test that production mode requires explicit ALLOWED_HOSTS configuration."""
     # This test documents that ALLOWED_HOSTS must be set in production
     # The actual validation happens at module import time in main.py
     
     # Verify that in our test environment (development), we have allowed hosts configured
-    from app.main import ALLOWED_HOSTS
-    assert len(ALLOWED_HOSTS) > 0
+    assert len(allowed_hosts) > 0
     
     # In production, the code raises ValueError if ALLOWED_HOSTS is not set
     # This is tested by the validation logic in main.py:
     # if ENVIRONMENT == "production" and not allowed_hosts_env: raise ValueError(...)
-
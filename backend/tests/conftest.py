@@ -1,68 +1,151 @@
-import asyncio
-from typing import AsyncGenerator, Generator
+from typing import AsyncGenerator, Awaitable, Callable, Generator
 
 import httpx
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient
+from passlib.context import CryptContext
+from sqlalchemy import event, insert
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
-from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.pool import StaticPool
 
+from app.core import security
+from app.core.security import create_access_token
 from app.core.database import Base, get_db
+from app.core.rate_limit import limiter
 from app.main import app
+from app.models.allowed_person import AllowedPerson
+from app.models.user import User, UserRole
+from tests.factories import AUTH_DNIS, make_user
 
-# Use in-memory SQLite for testing
+# Use in-memory SQLite for testing. The database lives in the process, so
+# pytest-xdist workers (pytest -n auto) each get their own without a per-worker URL
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 
-@pytest.fixture(scope="session")
-def event_loop() -> Generator:
-    """Create an event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing() -> Generator[None, None, None]:
+    """
+    Hash passwords with the minimum bcrypt cost during tests.
+    
+    At the default cost every registration and login spends about 0.3 s in
+    bcrypt; hashes stay real bcrypt hashes, just cheap ones.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(security, "pwd_context", CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=4))
+        yield
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits() -> None:
+    """Start every test with empty rate limit counters; all test requests share one client address."""
+    limiter.reset()
 
 
-@pytest_asyncio.fixture(scope="function")
+@pytest_asyncio.fixture(scope="session")
 async def test_engine() -> AsyncGenerator[AsyncEngine, None]:
-    """Create a test database engine."""
-    engine = create_async_engine(TEST_DATABASE_URL, echo=False, future=True)
+    """Create the test database engine and schema once per session."""
+    # An in-memory database only lives as long as its connection: StaticPool
+    # keeps a single one, so the schema created here is the one tests see
+    engine = create_async_engine(TEST_DATABASE_URL, echo=False, future=True, poolclass=StaticPool)
+    
+    # pysqlite's own transaction handling breaks SAVEPOINTs; let SQLAlchemy
+    # emit BEGIN itself so each test can run inside a rolled back transaction
+    @event.listens_for(engine.sync_engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine.sync_engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
     
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     
     yield engine
     
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-    
     await engine.dispose()
 
 
-@pytest_asyncio.fixture(scope="function")
+@pytest_asyncio.fixture
 async def test_db(test_engine: AsyncEngine) -> AsyncGenerator[AsyncSession, None]:
-    """Create a test database session."""
-    async_session = async_sessionmaker(
-        test_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-        autocommit=False,
-        autoflush=False,
-    )
+    """
+    Create a test database session.
     
-    async with async_session() as session:
-        yield session
+    The session runs inside a transaction that is rolled back after the test;
+    commits made by the test or the app only release a SAVEPOINT.
+    """
+    async with test_engine.connect() as conn:
+        transaction = await conn.begin()
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            autoflush=False,
+            join_transaction_mode="create_savepoint",
+        )
+        try:
+            yield session
+        finally:
+            await session.close()
+            await transaction.rollback()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def asgi_client() -> AsyncGenerator[AsyncClient, None]:
+    """One in-process HTTP client for the session; requests go straight to the ASGI app."""
+    async with AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
 
 
-@pytest_asyncio.fixture(scope="function")
-async def client(test_db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
+@pytest_asyncio.fixture
+async def client(asgi_client: AsyncClient, test_db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     """Create a test client with overridden database dependency."""
     async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
         yield test_db
     
     app.dependency_overrides[get_db] = override_get_db
+    # The client is shared across tests; don't carry cookies from one to the next
+    asgi_client.cookies.clear()
     
-    async with AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
-        yield ac
+    yield asgi_client
     
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="session")
+def auth_headers() -> dict[str, dict[str, str]]:
+    """Bearer headers per role for the users in AUTH_DNIS, minted once per session."""
+    return {
+        role: {"Authorization": f"Bearer {create_access_token({'sub': dni, 'role': role})}"}
+        for role, dni in AUTH_DNIS.items()
+    }
+
+
+@pytest_asyncio.fixture
+async def seeded_users(test_db: AsyncSession) -> dict[str, User]:
+    """
+    One active user per AUTH_DNIS role, keyed by role.
+    
+    The rows are inserted directly, skipping the whitelist and bcrypt, for
+    tests about what a role may do rather than about registration.
+    """
+    users = {role: make_user(dni, f"{role.title()} User", UserRole(role)) for role, dni in AUTH_DNIS.items()}
+    test_db.add_all(users.values())
+    await test_db.flush()
+    return users
+
+
+@pytest.fixture
+def patient_id(seeded_users: dict[str, User]) -> int:
+    """Id of the seeded patient user, the one auth_headers["patient"] belongs to."""
+    return seeded_users["patient"].id
+
+
+@pytest.fixture
+def seed_allowed(test_db: AsyncSession) -> Callable[[list[dict]], Awaitable[None]]:
+    """Insert whitelist rows directly, for tests whose subject is not the bulk import."""
+    async def _seed(rows: list[dict]) -> None:
+        await test_db.execute(insert(AllowedPerson), rows)
+        await test_db.flush()
+    
+    return _seed
@@ -0,0 +1,25 @@
+"""Tests for password hashing helpers."""
+from passlib.context import CryptContext
+
+from app.core.security import get_password_hash, verify_password
+
+
+def test_verify_password_accepts_default_cost_hashes():
+    """Test that hashes made at the production bcrypt cost verify.
+
+    The test session hashes at the minimum cost (see conftest); this keeps
+    one check on a hash made with passlib's default bcrypt settings.
+    """
+    hashed = CryptContext(schemes=["bcrypt"]).hash("securepass123")
+
+    assert verify_password("securepass123", hashed) is True
+    assert verify_password("wrongpass123", hashed) is False
+
+
+def test_get_password_hash_round_trips():
+    """Test that a hashed password verifies and is not stored in plain text."""
+    hashed = get_password_hash("securepass123")
+
+    assert hashed != "securepass123"
+    assert hashed.startswith("$2")
+    assert verify_password("securepass123", hashed) is True
@@ -0,0 +1,19 @@
+from app.models.user import User, UserRole
+
+# DNI each role's test user registers with
+AUTH_DNIS = {
+    "patient": "11111111111",
+    "admin": "77777777777",
+    "doctor": "88888888888",
+    "staff": "99999999999",
+}
+
+
+# Stored as-is for users that never log in; nothing verifies it, so it needn't be a real hash
+PLACEHOLDER_PASSWORD_HASH = "hashed"
+
+
+def make_user(dni: str, full_name: str, role: UserRole = UserRole.PATIENT, **overrides) -> User:
+    """A user to add to the test session directly, active once flushed; the password hash is a placeholder."""
+    fields = {"hashed_password": PLACEHOLDER_PASSWORD_HASH, **overrides}
+    return User(dni=dni, full_name=full_name, role=role, **fields)
@@ -2,28 +2,24 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User, UserRole
-from app.repositories.user_repository import UserRepository
+from tests.factories import make_user
 
+USER_ROLE_NAMES = frozenset(UserRole.__members__)
 
-@pytest.mark.asyncio
-async def test_user_role_enum_has_staff(test_db: AsyncSession):
+
+def test_user_role_enum_has_staff():
     """Test that UserRole enum includes STAFF role."""
     assert hasattr(UserRole, "STAFF")
     assert UserRole.STAFF.value == "staff"
-    assert UserRole.STAFF in list(UserRole)
+    assert "STAFF" in USER_ROLE_NAMES
 
 
 @pytest.mark.asyncio
 async def test_create_user_with_staff_role(test_db: AsyncSession):
     """Test creating a user with STAFF role."""
-    user_repo = UserRepository(test_db)
-    
-    user = await user_repo.create(
-        dni="12345678901",
-        hashed_password="hashed_test_password",
-        full_name="Test Staff User",
-        role=UserRole.STAFF,
-    )
+    user = make_user("12345678901", "Test Staff User", UserRole.STAFF)
+    test_db.add(user)
+    await test_db.flush()
     
     assert user.id is not None
     assert user.dni == "12345678901"
@@ -33,8 +29,7 @@ async def test_create_user_with_staff_role(test_db: AsyncSession):
     assert user.is_active is True
 
 
-@pytest.mark.asyncio
-async def test_user_dni_is_unique_indexed_notnull(test_db: AsyncSession):
+def test_user_dni_is_unique_indexed_notnull():
     """Test that DNI field has correct constraints (unique, indexed, not null)."""
     # Get the User table metadata
     user_table = User.__table__
@@ -47,13 +42,10 @@ async def test_user_dni_is_unique_indexed_notnull(test_db: AsyncSession):
     assert dni_column.index is True  # indexed
 
 
-@pytest.mark.asyncio
-async def test_all_user_roles_available(test_db: AsyncSession):
+def test_all_user_roles_available():
     """Test that all expected user roles are available."""
     expected_roles = {"PATIENT", "DOCTOR", "ADMIN", "STAFF"}
-    actual_roles = {role.name for role in UserRole}
-    
-    assert actual_roles == expected_roles
+    assert USER_ROLE_NAMES == expected_roles
     
     # Verify values
     assert UserRole.PATIENT.value == "patient"
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.medical_record_repository import (
+    MedicalRecordRepository,
+    _append_entry_statement,
+    _filtered_entries_query,
+)
+from app.repositories.user_repository import UserRepository
+from tests.factories import PLACEHOLDER_PASSWORD_HASH
+
+
+@pytest.mark.asyncio
+async def test_get_entries_filters_by_type_and_date(test_db: AsyncSession):
+    """Test that get_entries only returns entries matching the filters."""
+    user_repo = UserRepository(test_db)
+    patient = await user_repo.create(
+        dni="12345678901",
+        hashed_password=PLACEHOLDER_PASSWORD_HASH,
+        full_name="Test Patient",
+    )
+    
+    medical_record_repo = MedicalRecordRepository(test_db)
+    await medical_record_repo.create(patient_id=patient.id)
+    await medical_record_repo.add_entry(
+        patient_id=patient.id,
+        entry={"entry_type": "consultation", "diagnosis": "Flu"}
+    )
+    await medical_record_repo.add_entry(
+        patient_id=patient.id,
+        entry={"entry_type": "lab_result", "results": {"glucose": "90"}}
+    )
+    
+    all_entries = await medical_record_repo.get_entries(patient.id)
+    assert len(all_entries) == 2
+    
+    lab_entries = await medical_record_repo.get_entries(patient.id, entry_type="lab_result")
+    assert [e["entry_type"] for e in lab_entries] == ["lab_result"]
+    
+    future = datetime.now(timezone.utc) + timedelta(days=1)
+    assert await medical_record_repo.get_entries(patient.id, since=future) == []
+    
+    # Patients without a record have no entries
+    assert await medical_record_repo.get_entries(patient.id + 1) == []
+
+
+@pytest.mark.asyncio
+async def test_add_entry_updates_last_entry_at(test_db: AsyncSession):
+    """Test that adding an entry stamps last_entry_at for recent-activity queries."""
+    user_repo = UserRepository(test_db)
+    patient = await user_repo.create(
+        dni="12345678901",
+        hashed_password=PLACEHOLDER_PASSWORD_HASH,
+        full_name="Test Patient",
+    )
+    
+    medical_record_repo = MedicalRecordRepository(test_db)
+    medical_record = await medical_record_repo.create(patient_id=patient.id)
+    assert medical_record.last_entry_at is None
+    assert await medical_record_repo.get_recently_updated() == []
+    
+    medical_record = await medical_record_repo.add_entry(
+        patient_id=patient.id,
+        entry={"entry_type": "consultation", "diagnosis": "Flu"}
+    )
+    assert medical_record.last_entry_at is not None
+    
+    recent = await medical_record_repo.get_recently_updated()
+    assert [r.patient_id for r in recent] == [patient.id]
+
+
+def test_filtered_entries_query_compiles_for_postgresql():
+    """Test the PostgreSQL entries filter pushes both filters into one jsonpath."""
+    query = _filtered_entries_query(1, "lab_result", "2026-01-01T00:00:00+00:00")
+    compiled = query.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    
+    assert "jsonb_path_query_array(medical_records.entries" in sql
+    # Containment check that the GIN index on entries can answer
+    assert "medical_records.entries @> " in sql
+    assert compiled.params["param_1"] == "$[*] ? (@.entry_type == $entry_type && @.timestamp >= $since)"
+    # Filter values are bound as jsonpath vars, never spliced into the path
+    assert compiled.params["path_vars"] == {
+        "entry_type": "lab_result",
+        "since": "2026-01-01T00:00:00+00:00",
+    }
+    assert compiled.params["param_2"] == [{"entry_type": "lab_result"}]
+
+
+def test_filtered_entries_query_without_filters_compiles_for_postgresql():
+    """Test the unfiltered PostgreSQL query returns every entry without a containment check."""
+    compiled = _filtered_entries_query(1, None, None).compile(dialect=postgresql.dialect())
+    
+    assert "@>" not in str(compiled)
+    assert compiled.params["param_1"] == "$[*]"
+    assert compiled.params["path_vars"] == {}
+
+
+def test_append_entry_statement_compiles_for_postgresql():
+    """Test the PostgreSQL append is a single UPDATE concatenating onto the array."""
+    entry = {"entry_type": "consultation", "diagnosis": "Flu"}
+    entry_timestamp = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    compiled = _append_entry_statement(1, entry, entry_timestamp).compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    
+    assert sql.startswith("UPDATE medical_records SET entries=(coalesce(medical_records.entries, ")
+    assert "|| %(new_entries)s::JSONB" in sql
+    assert "WHERE medical_records.patient_id = " in sql
+    assert "RETURNING medical_records.id" in sql
+    # The new entry is bound as a one-element array, not spliced into the SQL
+    assert compiled.params["new_entries"] == [entry]
+    assert compiled.params["last_entry_at"] == entry_timestamp
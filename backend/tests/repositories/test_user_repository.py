@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.medical_record_repository import MedicalRecordRepository
+from app.repositories.user_repository import UserRepository
+from tests.factories import PLACEHOLDER_PASSWORD_HASH
+
+
+@pytest.mark.asyncio
+async def test_get_with_record_loads_medical_record(test_db: AsyncSession):
+    """Test that the user is loaded together with their medical record."""
+    user_repo = UserRepository(test_db)
+    patient = await user_repo.create(
+        dni="12345678901",
+        hashed_password=PLACEHOLDER_PASSWORD_HASH,
+        full_name="Test Patient",
+    )
+    
+    medical_record_repo = MedicalRecordRepository(test_db)
+    await medical_record_repo.create(
+        patient_id=patient.id,
+        registration_survey={"allergies": "None"}
+    )
+    
+    user = await user_repo.get_with_record(patient.id)
+    assert user is not None
+    assert user.medical_record is not None
+    assert user.medical_record.registration_survey == {"allergies": "None"}
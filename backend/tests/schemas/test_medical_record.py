@@ -0,0 +1,60 @@
+"""Tests for medical record schemas."""
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.medical_record import AllowedPersonBulkCreate, MedicalRecordEntryCreate
+
+
+class TestMedicalRecordEntryCreate:
+    """Test MedicalRecordEntryCreate schema."""
+    
+    def test_valid_entry(self):
+        """Test creating a valid MedicalRecordEntryCreate."""
+        entry = MedicalRecordEntryCreate(
+            entry_type="lab_result",
+            results={"glucose": 90},
+        )
+        assert entry.entry_type == "lab_result"
+        assert entry.results == {"glucose": 90}
+        assert entry.diagnosis is None
+    
+    def test_entry_rejects_unknown_fields(self):
+        """Test MedicalRecordEntryCreate rejects fields it does not define."""
+        with pytest.raises(ValidationError) as exc_info:
+            MedicalRecordEntryCreate(entry_type="consultation", unknown="x")
+        assert "unknown" in str(exc_info.value)
+    
+    def test_entry_is_frozen(self):
+        """Test MedicalRecordEntryCreate instances are immutable."""
+        entry = MedicalRecordEntryCreate(entry_type="consultation")
+        with pytest.raises(ValidationError):
+            entry.notes = "changed"
+
+
+class TestAllowedPersonBulkCreate:
+    """Test AllowedPersonBulkCreate schema."""
+    
+    def test_persons_are_plain_dicts(self):
+        """Test persons are validated into dicts, with full_name optional."""
+        data = AllowedPersonBulkCreate(persons=[
+            {"dni": "12345678901", "full_name": "Jane Doe"},
+            {"dni": "98765432100"},
+        ])
+        assert data.persons == [
+            {"dni": "12345678901", "full_name": "Jane Doe"},
+            {"dni": "98765432100"},
+        ]
+    
+    def test_persons_reject_non_string_dni(self):
+        """Test a numeric DNI is not silently coerced to a string."""
+        with pytest.raises(ValidationError):
+            AllowedPersonBulkCreate(persons=[{"dni": 12345678901}])
+    
+    def test_persons_reject_malformed_dnis(self):
+        """Test the batch is rejected if any DNI is not 11 digits."""
+        with pytest.raises(ValidationError) as exc_info:
+            AllowedPersonBulkCreate(persons=[
+                {"dni": "12345678901"},
+                {"dni": "1234567890a"},
+            ])
+        assert "1234567890a" in str(exc_info.value)
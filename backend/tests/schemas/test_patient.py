@@ -26,46 +26,35 @@ class TestPatientCreate:
         assert patient.full_name == "Jane Doe"
         assert patient.password == "securepass123"
     
-    def test_patient_create_with_invalid_dni_length(self):
-        """Test PatientCreate with invalid DNI length."""
-        data = {
-            "dni": "123456789",  # Too short
-            "full_name": "Jane Doe",
-            "password": "securepass123"
-        }
-        with pytest.raises(ValidationError) as exc_info:
-            PatientCreate(**data)
-        assert "dni" in str(exc_info.value).lower()
-    
-    def test_patient_create_with_non_numeric_dni(self):
-        """Test PatientCreate with non-numeric DNI."""
-        data = {
-            "dni": "1234567890a",  # Contains letter
-            "full_name": "Jane Doe",
-            "password": "securepass123"
-        }
-        with pytest.raises(ValidationError) as exc_info:
-            PatientCreate(**data)
-        assert "dni" in str(exc_info.value).lower()
-    
-    def test_patient_create_with_short_password(self):
-        """Test PatientCreate with password too short."""
+    @pytest.mark.parametrize(
+        "field, bad_value, expected_msg",
+        [
+            pytest.param("dni", "123456789", "at least 11 characters", id="dni_too_short"),
+            pytest.param("dni", "1234567890a", "DNI must be exactly 11 digits", id="dni_non_numeric"),
+            pytest.param("password", "short", "at least 6 characters", id="password_too_short"),
+        ],
+    )
+    def test_patient_create_rejects_invalid_field(self, field, bad_value, expected_msg):
+        """Test PatientCreate rejects an invalid value for a single field."""
         data = {
             "dni": "12345678901",
             "full_name": "Jane Doe",
-            "password": "short"
+            "password": "securepass123",
+            field: bad_value,
         }
         with pytest.raises(ValidationError) as exc_info:
             PatientCreate(**data)
-        assert "at least 6 characters" in str(exc_info.value)
+        errors = exc_info.value.errors()
+        assert [error["loc"] for error in errors] == [(field,)]
+        assert expected_msg in errors[0]["msg"]
     
     def test_patient_create_missing_required_fields(self):
         """Test PatientCreate with missing required fields."""
         data = {"dni": "12345678901"}
         with pytest.raises(ValidationError) as exc_info:
             PatientCreate(**data)
-        errors = str(exc_info.value).lower()
-        assert "full_name" in errors or "password" in errors
+        missing = {error["loc"][-1] for error in exc_info.value.errors() if error["type"] == "missing"}
+        assert missing == {"full_name", "password"}
 
 
 class TestTriageUpdate:
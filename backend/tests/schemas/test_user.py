@@ -3,7 +3,7 @@ import pytest
 from pydantic import ValidationError
 
 from app.schemas.user import StaffLoginRequest, UserCreate, UserResponse
-from app.models.user import UserRole
+from app.models.user import User, UserRole
 
 
 class TestStaffLoginRequest:
@@ -20,14 +20,14 @@ class TestStaffLoginRequest:
         data = {"password": "short"}
         with pytest.raises(ValidationError) as exc_info:
             StaffLoginRequest(**data)
-        assert "at least 6 characters" in str(exc_info.value)
+        assert any("at least 6 characters" in error["msg"] for error in exc_info.value.errors())
     
     def test_staff_login_request_missing_password(self):
         """Test StaffLoginRequest without password field."""
         data = {}
         with pytest.raises(ValidationError) as exc_info:
             StaffLoginRequest(**data)
-        assert "password" in str(exc_info.value).lower()
+        assert any(error["loc"][-1] == "password" for error in exc_info.value.errors())
 
 
 class TestUserCreate:
@@ -56,6 +56,17 @@ class TestUserCreate:
         }
         user = UserCreate(**data)
         assert user.role == UserRole.PATIENT
+    
+    def test_user_create_rejects_non_ascii_digits(self):
+        """Test UserCreate rejects DNIs made of non-ASCII digit characters."""
+        data = {
+            "dni": "١٢٣٤٥٦٧٨٩٠١",
+            "password": "securepass123",
+            "full_name": "John Doe"
+        }
+        with pytest.raises(ValidationError) as exc_info:
+            UserCreate(**data)
+        assert any(error["loc"][-1] == "dni" for error in exc_info.value.errors())
 
 
 class TestUserResponse:
@@ -76,3 +87,29 @@ class TestUserResponse:
         assert response.full_name == "John Doe"
         assert response.role == UserRole.PATIENT
         assert response.is_active is True
+    
+    def test_user_response_normalizes_role_case(self):
+        """Test UserResponse accepts roles regardless of case."""
+        data = {
+            "id": 1,
+            "dni": "12345678901",
+            "full_name": "John Doe",
+            "role": "PATIENT",
+            "is_active": True
+        }
+        response = UserResponse(**data)
+        assert response.role == UserRole.PATIENT
+    
+    def test_user_response_from_orm_fast(self):
+        """Test building a UserResponse from a User row without validation."""
+        user = User(
+            id=1,
+            dni="12345678901",
+            hashed_password="hashed",
+            full_name="John Doe",
+            role=UserRole.STAFF,
+            is_active=True,
+        )
+        response = UserResponse.from_orm_fast(user)
+        assert response == UserResponse.model_validate(user)
+        assert response.model_dump()["role"] == UserRole.STAFF
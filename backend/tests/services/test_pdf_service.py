@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.medical_record_repository import MedicalRecordRepository
+from app.services.pdf_service import generate_medical_record_pdf
+from tests.factories import make_user
+
+
+@pytest.mark.asyncio
+async def test_generate_medical_record_pdf_renders_with_dejavu(test_db: AsyncSession):
+    """Test rendering a real medical record PDF with the bundled DejaVu fonts."""
+    patient = make_user("12345678901", "José Muñoz")
+    test_db.add(patient)
+    await test_db.flush()
+    
+    medical_record_repo = MedicalRecordRepository(test_db)
+    await medical_record_repo.create(
+        patient_id=patient.id,
+        registration_survey={"chronic_diseases": ["Diabetes"], "allergies": "Penicilina"}
+    )
+    await medical_record_repo.add_entry(
+        patient_id=patient.id,
+        entry={"entry_type": "consultation", "specialty": "Cardiología", "diagnosis": "Hipertensión"}
+    )
+    
+    pdf_bytes = await generate_medical_record_pdf(patient.id, test_db)
+    
+    assert pdf_bytes.startswith(b"%PDF-")
+    assert pdf_bytes.rstrip().endswith(b"%%EOF")
+    # The regular, bold and oblique faces are embedded, not the Helvetica fallback
+    for face in (b"DejaVuSansBook", b"DejaVuSansBold", b"DejaVuSansOblique"):
+        assert face in pdf_bytes
+    assert b"Helvetica" not in pdf_bytes
+
+
+@pytest.mark.asyncio
+async def test_generate_medical_record_pdf_requires_medical_record(test_db: AsyncSession):
+    """Test that patients without a medical record cannot get a PDF."""
+    patient = make_user("12345678901", "Test Patient")
+    test_db.add(patient)
+    await test_db.flush()
+    
+    with pytest.raises(ValueError, match="No medical record found"):
+        await generate_medical_record_pdf(patient.id, test_db)
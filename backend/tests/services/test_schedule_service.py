@@ -1,56 +1,41 @@
 import pytest
-from datetime import datetime, time, timedelta
+import pytest_asyncio
+from datetime import datetime, time
+from freezegun import freeze_time
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.category_schedule import CategorySchedule, CategoryType, RotationType
 from app.models.appointment import Appointment, AppointmentStatus
-from app.models.user import User, UserRole
+from app.models.user import User
 from app.services.schedule_service import ScheduleService
+from tests.factories import make_user
 
+# Sunday, Jan 7, 2024: "now" for the tests, the day before MONDAY
+SUNDAY = datetime(2024, 1, 7, 12, 0)
+# Monday, Jan 8, 2024, and the four turns cardiology_category offers that day
+MONDAY = datetime(2024, 1, 8)
+CARDIOLOGY_SLOTS = [
+    datetime(2024, 1, 8, 9, 0),
+    datetime(2024, 1, 8, 9, 30),
+    datetime(2024, 1, 8, 10, 0),
+    datetime(2024, 1, 8, 10, 30),
+]
+# First turn of cardiology_category on the Mondays after MONDAY
+NEXT_CARDIOLOGY_SLOTS = [datetime(2024, 1, 15, 9, 0), datetime(2024, 1, 22, 9, 0)]
+# Turn start times of alternated_category on its active Mondays
+BLOOD_TEST_TURNS = [time(8, 0), time(8, 15), time(8, 30)]
 
-@pytest.mark.asyncio
-async def test_get_available_slots_fixed_rotation(test_db: AsyncSession):
-    """Test getting available slots for a FIXED rotation schedule."""
-    # Create a category schedule with FIXED rotation
-    category = CategorySchedule(
-        category_type=CategoryType.SPECIALTY,
-        name="Cardiology",
-        day_of_week=0,  # Monday
-        start_time=time(9, 0),
-        turn_duration=30,
-        max_turns_per_block=4,
-        rotation_type=RotationType.FIXED,
-        rotation_weeks=1,
-    )
-    test_db.add(category)
-    await test_db.commit()
-    await test_db.refresh(category)
-    
-    # Create service
-    service = ScheduleService(test_db)
-    
-    # Test for a Monday
-    test_date = datetime(2024, 1, 8, 0, 0)  # Monday, Jan 8, 2024
-    slots = await service.get_available_slots(category.id, test_date)
-    
-    # Should have 4 slots (max_turns_per_block)
-    assert len(slots) == 4
-    
-    # Check slot times
-    assert slots[0].slot_datetime == datetime(2024, 1, 8, 9, 0)
-    assert slots[1].slot_datetime == datetime(2024, 1, 8, 9, 30)
-    assert slots[2].slot_datetime == datetime(2024, 1, 8, 10, 0)
-    assert slots[3].slot_datetime == datetime(2024, 1, 8, 10, 30)
-    
-    # Check slot metadata
-    assert all(slot.category_name == "Cardiology" for slot in slots)
-    assert all(slot.category_id == category.id for slot in slots)
 
+@pytest.fixture
+def frozen_now(request: pytest.FixtureRequest):
+    """Pin the clock the slot search starts from; SUNDAY unless parametrized indirectly."""
+    with freeze_time(getattr(request, "param", SUNDAY)):
+        yield
 
-@pytest.mark.asyncio
-async def test_get_available_slots_wrong_day(test_db: AsyncSession):
-    """Test that no slots are returned for wrong day of week."""
-    # Create a category schedule for Monday
+
+@pytest_asyncio.fixture
+async def cardiology_category(test_db: AsyncSession) -> CategorySchedule:
+    """A FIXED Cardiology block on Mondays: four 30 minute turns from 9:00."""
     category = CategorySchedule(
         category_type=CategoryType.SPECIALTY,
         name="Cardiology",
@@ -59,26 +44,30 @@ async def test_get_available_slots_wrong_day(test_db: AsyncSession):
         turn_duration=30,
         max_turns_per_block=4,
         rotation_type=RotationType.FIXED,
-        rotation_weeks=1,
     )
     test_db.add(category)
-    await test_db.commit()
-    await test_db.refresh(category)
-    
-    service = ScheduleService(test_db)
-    
-    # Test for a Tuesday (wrong day)
-    test_date = datetime(2024, 1, 9, 0, 0)  # Tuesday
-    slots = await service.get_available_slots(category.id, test_date)
-    
-    # Should have no slots
-    assert len(slots) == 0
+    await test_db.flush()
+    return category
 
 
-@pytest.mark.asyncio
-async def test_get_available_slots_alternated_rotation_active_week(test_db: AsyncSession):
-    """Test getting slots for ALTERNATED rotation on an active week."""
-    # Create a category schedule with ALTERNATED rotation (every 2 weeks)
+@pytest_asyncio.fixture
+async def patient(test_db: AsyncSession) -> User:
+    """A patient for tests that book appointments."""
+    patient = make_user("12345678", "John Doe")
+    test_db.add(patient)
+    await test_db.flush()
+    return patient
+
+
+@pytest.fixture
+def schedule_service(test_db: AsyncSession) -> ScheduleService:
+    """The service under test, reading through the test session."""
+    return ScheduleService(test_db)
+
+
+@pytest_asyncio.fixture
+async def alternated_category(request: pytest.FixtureRequest, test_db: AsyncSession) -> CategorySchedule:
+    """An ALTERNATED Blood Test block on Mondays, every ``request.param`` weeks: three 15 minute turns from 8:00."""
     category = CategorySchedule(
         category_type=CategoryType.LABORATORY,
         name="Blood Test",
@@ -87,349 +76,237 @@ async def test_get_available_slots_alternated_rotation_active_week(test_db: Asyn
         turn_duration=15,
         max_turns_per_block=3,
         rotation_type=RotationType.ALTERNATED,
-        rotation_weeks=2,
+        rotation_weeks=request.param,
     )
     test_db.add(category)
-    await test_db.commit()
-    await test_db.refresh(category)
-    
-    service = ScheduleService(test_db)
-    
-    # Test for Monday, Jan 1, 2024 (anchor date, week 0)
-    test_date = datetime(2024, 1, 1, 0, 0)
-    slots = await service.get_available_slots(category.id, test_date)
-    
-    # Should have 3 slots
-    assert len(slots) == 3
-    assert slots[0].slot_datetime == datetime(2024, 1, 1, 8, 0)
-    assert slots[1].slot_datetime == datetime(2024, 1, 1, 8, 15)
-    assert slots[2].slot_datetime == datetime(2024, 1, 1, 8, 30)
+    await test_db.flush()
+    return category
+
+
 
 
 @pytest.mark.asyncio
-async def test_get_available_slots_alternated_rotation_inactive_week(test_db: AsyncSession):
-    """Test that no slots are returned for ALTERNATED rotation on an inactive week."""
-    # Create a category schedule with ALTERNATED rotation (every 2 weeks)
-    category = CategorySchedule(
-        category_type=CategoryType.LABORATORY,
-        name="Blood Test",
-        day_of_week=0,  # Monday
-        start_time=time(8, 0),
-        turn_duration=15,
-        max_turns_per_block=3,
-        rotation_type=RotationType.ALTERNATED,
-        rotation_weeks=2,
-    )
-    test_db.add(category)
-    await test_db.commit()
-    await test_db.refresh(category)
+async def test_get_next_available_slots_fixed_rotation(
+    schedule_service: ScheduleService, cardiology_category: CategorySchedule, frozen_now
+):
+    """Test getting the next slots of a FIXED rotation schedule, one per day."""
+    category = cardiology_category
     
-    service = ScheduleService(test_db)
+    slots = await schedule_service.get_next_available_slots("Cardiology", CategoryType.SPECIALTY)
     
-    # Test for Monday, Jan 8, 2024 (week 1 from anchor, should be inactive)
-    test_date = datetime(2024, 1, 8, 0, 0)
-    slots = await service.get_available_slots(category.id, test_date)
+    # The first turn of each of the next 3 Mondays
+    assert [slot.slot_datetime for slot in slots] == CARDIOLOGY_SLOTS[:1] + NEXT_CARDIOLOGY_SLOTS
     
-    # Should have no slots (inactive week)
-    assert len(slots) == 0
+    # Check slot metadata
+    assert all(slot.category_name == "Cardiology" for slot in slots)
+    assert all(slot.category_id == category.id for slot in slots)
 
 
 @pytest.mark.asyncio
-async def test_get_available_slots_alternated_rotation_next_active_week(test_db: AsyncSession):
-    """Test getting slots for ALTERNATED rotation on the next active week."""
-    # Create a category schedule with ALTERNATED rotation (every 2 weeks)
-    category = CategorySchedule(
-        category_type=CategoryType.LABORATORY,
-        name="Blood Test",
-        day_of_week=0,  # Monday
-        start_time=time(8, 0),
-        turn_duration=15,
-        max_turns_per_block=3,
-        rotation_type=RotationType.ALTERNATED,
-        rotation_weeks=2,
-    )
-    test_db.add(category)
-    await test_db.commit()
-    await test_db.refresh(category)
-    
-    service = ScheduleService(test_db)
+async def test_get_next_available_slots_respects_limit(
+    schedule_service: ScheduleService, cardiology_category: CategorySchedule, frozen_now
+):
+    """Test that no more than ``limit`` slots are returned."""
+    slots = await schedule_service.get_next_available_slots("Cardiology", CategoryType.SPECIALTY, limit=1)
     
-    # Test for Monday, Jan 15, 2024 (week 2 from anchor, should be active again)
-    test_date = datetime(2024, 1, 15, 0, 0)
-    slots = await service.get_available_slots(category.id, test_date)
+    assert [slot.slot_datetime for slot in slots] == CARDIOLOGY_SLOTS[:1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("frozen_now", [datetime(2024, 1, 8, 9, 45)], indirect=True)
+async def test_get_next_available_slots_skips_past_turns_today(
+    schedule_service: ScheduleService, cardiology_category: CategorySchedule, frozen_now
+):
+    """Test that turns earlier today are not offered."""
+    slots = await schedule_service.get_next_available_slots("Cardiology", CategoryType.SPECIALTY, limit=1)
+    
+    assert [slot.slot_datetime for slot in slots] == CARDIOLOGY_SLOTS[2:3]
+
+
+@pytest.mark.asyncio
+async def test_get_next_available_slots_wrong_category_type(
+    schedule_service: ScheduleService, cardiology_category: CategorySchedule, frozen_now
+):
+    """Test that a category name only matches blocks of the requested type."""
+    slots = await schedule_service.get_next_available_slots("Cardiology", CategoryType.LABORATORY)
     
-    # Should have 3 slots
-    assert len(slots) == 3
+    # Should have no slots
+    assert len(slots) == 0
 
 
 @pytest.mark.asyncio
-async def test_get_available_slots_filters_occupied(test_db: AsyncSession):
+async def test_get_next_available_slots_filters_occupied(
+    test_db: AsyncSession,
+    schedule_service: ScheduleService,
+    cardiology_category: CategorySchedule,
+    patient: User,
+    frozen_now,
+):
     """Test that occupied slots are filtered out."""
-    # Create users (patient and doctor)
-    patient = User(
-        dni="12345678",
-        hashed_password="hashed",
-        full_name="John Doe",
-        role=UserRole.PATIENT,
-        is_active=True,
-    )
-    doctor = User(
-        dni="87654321",
-        hashed_password="hashed",
-        full_name="Dr. Smith",
-        role=UserRole.DOCTOR,
-        is_active=True,
-    )
-    test_db.add(patient)
-    test_db.add(doctor)
-    await test_db.commit()
-    await test_db.refresh(patient)
-    await test_db.refresh(doctor)
-    
-    # Create a category schedule
-    category = CategorySchedule(
-        category_type=CategoryType.SPECIALTY,
-        name="Cardiology",
-        day_of_week=0,  # Monday
-        start_time=time(9, 0),
-        turn_duration=30,
-        max_turns_per_block=4,
-        rotation_type=RotationType.FIXED,
-        rotation_weeks=1,
-    )
-    test_db.add(category)
-    await test_db.commit()
-    await test_db.refresh(category)
-    
-    # Create an appointment occupying the second slot (9:30)
+    # Create an appointment occupying the first slot (9:00)
     appointment = Appointment(
         patient_id=patient.id,
-        doctor_id=doctor.id,
-        appointment_date=datetime(2024, 1, 8, 9, 30),
+        appointment_date=CARDIOLOGY_SLOTS[0],
         specialty="Cardiology",
         status=AppointmentStatus.SCHEDULED,
     )
     test_db.add(appointment)
-    await test_db.commit()
-    
-    service = ScheduleService(test_db)
+    await test_db.flush()
     
-    # Test for Monday, Jan 8, 2024
-    test_date = datetime(2024, 1, 8, 0, 0)
-    slots = await service.get_available_slots(category.id, test_date)
+    slots = await schedule_service.get_next_available_slots("Cardiology", CategoryType.SPECIALTY, limit=1)
     
-    # Should have 3 slots (4 total - 1 occupied)
-    assert len(slots) == 3
-    
-    # Verify the occupied slot (9:30) is not in the results
-    slot_times = [slot.slot_datetime for slot in slots]
-    assert datetime(2024, 1, 8, 9, 0) in slot_times
-    assert datetime(2024, 1, 8, 9, 30) not in slot_times  # Occupied
-    assert datetime(2024, 1, 8, 10, 0) in slot_times
-    assert datetime(2024, 1, 8, 10, 30) in slot_times
+    # The next free turn that day is 9:30
+    assert [slot.slot_datetime for slot in slots] == CARDIOLOGY_SLOTS[1:2]
 
 
 @pytest.mark.asyncio
-async def test_get_available_slots_filters_confirmed_appointments(test_db: AsyncSession):
+async def test_get_next_available_slots_filters_confirmed_appointments(
+    test_db: AsyncSession,
+    schedule_service: ScheduleService,
+    cardiology_category: CategorySchedule,
+    patient: User,
+    frozen_now,
+):
     """Test that confirmed appointments are also filtered out."""
-    # Create users
-    patient = User(
-        dni="12345678",
-        hashed_password="hashed",
-        full_name="John Doe",
-        role=UserRole.PATIENT,
-        is_active=True,
-    )
-    doctor = User(
-        dni="87654321",
-        hashed_password="hashed",
-        full_name="Dr. Smith",
-        role=UserRole.DOCTOR,
-        is_active=True,
-    )
-    test_db.add(patient)
-    test_db.add(doctor)
-    await test_db.commit()
-    await test_db.refresh(patient)
-    await test_db.refresh(doctor)
-    
-    # Create a category schedule
-    category = CategorySchedule(
-        category_type=CategoryType.SPECIALTY,
-        name="Cardiology",
-        day_of_week=0,  # Monday
-        start_time=time(9, 0),
-        turn_duration=30,
-        max_turns_per_block=4,
-        rotation_type=RotationType.FIXED,
-        rotation_weeks=1,
-    )
-    test_db.add(category)
-    await test_db.commit()
-    await test_db.refresh(category)
-    
     # Create a confirmed appointment
     appointment = Appointment(
         patient_id=patient.id,
-        doctor_id=doctor.id,
-        appointment_date=datetime(2024, 1, 8, 9, 0),
+        appointment_date=CARDIOLOGY_SLOTS[0],
         specialty="Cardiology",
         status=AppointmentStatus.CONFIRMED,
     )
     test_db.add(appointment)
-    await test_db.commit()
-    
-    service = ScheduleService(test_db)
+    await test_db.flush()
     
-    # Test for Monday, Jan 8, 2024
-    test_date = datetime(2024, 1, 8, 0, 0)
-    slots = await service.get_available_slots(category.id, test_date)
+    slots = await schedule_service.get_next_available_slots("Cardiology", CategoryType.SPECIALTY, limit=1)
     
-    # Should have 3 slots (4 total - 1 confirmed)
-    assert len(slots) == 3
-    
-    # Verify the confirmed slot is not in the results
-    slot_times = [slot.slot_datetime for slot in slots]
-    assert datetime(2024, 1, 8, 9, 0) not in slot_times  # Confirmed
+    assert [slot.slot_datetime for slot in slots] == CARDIOLOGY_SLOTS[1:2]
 
 
 @pytest.mark.asyncio
-async def test_get_available_slots_allows_cancelled_appointments(test_db: AsyncSession):
+async def test_get_next_available_slots_allows_cancelled_appointments(
+    test_db: AsyncSession,
+    schedule_service: ScheduleService,
+    cardiology_category: CategorySchedule,
+    patient: User,
+    frozen_now,
+):
     """Test that cancelled appointments don't block slots."""
-    # Create users
-    patient = User(
-        dni="12345678",
-        hashed_password="hashed",
-        full_name="John Doe",
-        role=UserRole.PATIENT,
-        is_active=True,
-    )
-    doctor = User(
-        dni="87654321",
-        hashed_password="hashed",
-        full_name="Dr. Smith",
-        role=UserRole.DOCTOR,
-        is_active=True,
-    )
-    test_db.add(patient)
-    test_db.add(doctor)
-    await test_db.commit()
-    await test_db.refresh(patient)
-    await test_db.refresh(doctor)
-    
-    # Create a category schedule
-    category = CategorySchedule(
-        category_type=CategoryType.SPECIALTY,
-        name="Cardiology",
-        day_of_week=0,  # Monday
-        start_time=time(9, 0),
-        turn_duration=30,
-        max_turns_per_block=4,
-        rotation_type=RotationType.FIXED,
-        rotation_weeks=1,
-    )
-    test_db.add(category)
-    await test_db.commit()
-    await test_db.refresh(category)
-    
     # Create a cancelled appointment
     appointment = Appointment(
         patient_id=patient.id,
-        doctor_id=doctor.id,
-        appointment_date=datetime(2024, 1, 8, 9, 0),
+        appointment_date=CARDIOLOGY_SLOTS[0],
         specialty="Cardiology",
         status=AppointmentStatus.CANCELLED,
     )
     test_db.add(appointment)
-    await test_db.commit()
+    await test_db.flush()
     
-    service = ScheduleService(test_db)
+    slots = await schedule_service.get_next_available_slots("Cardiology", CategoryType.SPECIALTY, limit=1)
     
-    # Test for Monday, Jan 8, 2024
-    test_date = datetime(2024, 1, 8, 0, 0)
-    slots = await service.get_available_slots(category.id, test_date)
-    
-    # Should have all 4 slots (cancelled appointment doesn't block)
-    assert len(slots) == 4
+    # The cancelled 9:00 turn is free again
+    assert [slot.slot_datetime for slot in slots] == CARDIOLOGY_SLOTS[:1]
 
 
 @pytest.mark.asyncio
-async def test_get_available_slots_nonexistent_category(test_db: AsyncSession):
+async def test_get_next_available_slots_skips_fully_booked_days(
+    test_db: AsyncSession,
+    schedule_service: ScheduleService,
+    cardiology_category: CategorySchedule,
+    patient: User,
+    frozen_now,
+):
+    """Test that a day with every turn booked is skipped."""
+    test_db.add_all([
+        Appointment(patient_id=patient.id, appointment_date=slot, specialty="Cardiology")
+        for slot in CARDIOLOGY_SLOTS
+    ])
+    await test_db.flush()
+    
+    slots = await schedule_service.get_next_available_slots("Cardiology", CategoryType.SPECIALTY, limit=2)
+    
+    assert [slot.slot_datetime for slot in slots] == NEXT_CARDIOLOGY_SLOTS
+
+
+@pytest.mark.asyncio
+async def test_get_next_available_slots_nonexistent_category(schedule_service: ScheduleService, frozen_now):
     """Test that empty list is returned for nonexistent category."""
-    service = ScheduleService(test_db)
-    
-    # Test with a nonexistent category ID
-    test_date = datetime(2024, 1, 8, 0, 0)
-    slots = await service.get_available_slots(999, test_date)
+    slots = await schedule_service.get_next_available_slots("Nonexistent", CategoryType.SPECIALTY)
     
     # Should return empty list
     assert len(slots) == 0
 
 
 @pytest.mark.asyncio
-async def test_alternated_rotation_3_week_cycle(test_db: AsyncSession):
-    """Test ALTERNATED rotation with a 3-week cycle."""
-    # Create a category schedule with 3-week rotation
-    category = CategorySchedule(
-        category_type=CategoryType.LABORATORY,
-        name="X-Ray",
-        day_of_week=0,  # Monday
-        start_time=time(10, 0),
-        turn_duration=20,
-        max_turns_per_block=2,
-        rotation_type=RotationType.ALTERNATED,
-        rotation_weeks=3,
-    )
-    test_db.add(category)
-    await test_db.commit()
-    await test_db.refresh(category)
-    
-    service = ScheduleService(test_db)
-    
-    # Test week 0 (Jan 1, 2024) - should be active
-    test_date = datetime(2024, 1, 1, 0, 0)
-    slots = await service.get_available_slots(category.id, test_date)
-    assert len(slots) == 2
-    
-    # Test week 1 (Jan 8, 2024) - should be inactive
-    test_date = datetime(2024, 1, 8, 0, 0)
-    slots = await service.get_available_slots(category.id, test_date)
-    assert len(slots) == 0
-    
-    # Test week 2 (Jan 15, 2024) - should be inactive
-    test_date = datetime(2024, 1, 15, 0, 0)
-    slots = await service.get_available_slots(category.id, test_date)
-    assert len(slots) == 0
-    
-    # Test week 3 (Jan 22, 2024) - should be active again
-    test_date = datetime(2024, 1, 22, 0, 0)
-    slots = await service.get_available_slots(category.id, test_date)
-    assert len(slots) == 2
+@pytest.mark.parametrize(
+    "alternated_category, frozen_now, expected_days",
+    [
+        # Every 2 weeks, counted from the Jan 1, 2024 anchor
+        pytest.param(
+            2, datetime(2023, 12, 31), [datetime(2024, 1, 1), datetime(2024, 1, 15), datetime(2024, 1, 29)],
+            id="2_weeks_from_anchor_week",
+        ),
+        pytest.param(
+            2, datetime(2024, 1, 2), [datetime(2024, 1, 15), datetime(2024, 1, 29), datetime(2024, 2, 12)],
+            id="2_weeks_skips_inactive_week",
+        ),
+        # Every 3 weeks
+        pytest.param(
+            3, datetime(2023, 12, 31), [datetime(2024, 1, 1), datetime(2024, 1, 22), datetime(2024, 2, 12)],
+            id="3_weeks_from_anchor_week",
+        ),
+        # Mondays before the anchor date have no slots
+        pytest.param(
+            2, datetime(2023, 12, 17), [datetime(2024, 1, 1), datetime(2024, 1, 15), datetime(2024, 1, 29)],
+            id="before_anchor_date",
+        ),
+    ],
+    indirect=["alternated_category", "frozen_now"],
+)
+async def test_get_next_available_slots_alternated_rotation(
+    schedule_service: ScheduleService,
+    alternated_category: CategorySchedule,
+    frozen_now,
+    expected_days: list[datetime],
+):
+    """Test that an ALTERNATED rotation only has slots on its active weeks."""
+    slots = await schedule_service.get_next_available_slots("Blood Test", CategoryType.LABORATORY)
+    
+    assert [slot.slot_datetime for slot in slots] == [
+        datetime.combine(day.date(), BLOOD_TEST_TURNS[0]) for day in expected_days
+    ]
 
 
 @pytest.mark.asyncio
-async def test_alternated_rotation_before_anchor_date(test_db: AsyncSession):
-    """Test that dates before the anchor date return no slots."""
-    # Create a category schedule with ALTERNATED rotation
-    category = CategorySchedule(
-        category_type=CategoryType.LABORATORY,
-        name="Blood Test",
-        day_of_week=0,  # Monday
-        start_time=time(8, 0),
-        turn_duration=15,
-        max_turns_per_block=3,
-        rotation_type=RotationType.ALTERNATED,
-        rotation_weeks=2,
-    )
-    test_db.add(category)
-    await test_db.commit()
-    await test_db.refresh(category)
-    
-    service = ScheduleService(test_db)
-    
-    # Test for a date before the anchor (December 25, 2023 - Monday)
-    test_date = datetime(2023, 12, 25, 0, 0)
-    slots = await service.get_available_slots(category.id, test_date)
-    
-    # Should have no slots (date is before anchor)
-    assert len(slots) == 0
+async def test_get_next_available_slots_checks_occupancy_of_needed_days_only(
+    test_db: AsyncSession,
+    schedule_service: ScheduleService,
+    cardiology_category: CategorySchedule,
+    patient: User,
+    frozen_now,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that occupancy is looked up for the next ``limit`` days, then only for days still needed."""
+    windows = []
+    get_occupied_datetimes = schedule_service._get_occupied_datetimes
+    
+    async def record_window(category_name, first_slot, last_slot):
+        windows.append((first_slot, last_slot))
+        return await get_occupied_datetimes(category_name, first_slot, last_slot)
+    
+    monkeypatch.setattr(schedule_service, "_get_occupied_datetimes", record_window)
+    
+    # Fully book MONDAY, so a third Monday is needed for the second slot
+    test_db.add_all([
+        Appointment(patient_id=patient.id, appointment_date=slot, specialty="Cardiology")
+        for slot in CARDIOLOGY_SLOTS
+    ])
+    await test_db.flush()
+    
+    slots = await schedule_service.get_next_available_slots("Cardiology", CategoryType.SPECIALTY, limit=2)
+    
+    assert [slot.slot_datetime for slot in slots] == NEXT_CARDIOLOGY_SLOTS
+    assert windows == [
+        (CARDIOLOGY_SLOTS[0], datetime(2024, 1, 15, 10, 30)),
+        (NEXT_CARDIOLOGY_SLOTS[1], datetime(2024, 1, 22, 10, 30)),
+    ]